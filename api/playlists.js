@@ -1,5 +1,37 @@
+// ?index=1          -> <YOUTUBE_PLAYLISTS_BASE_URL>/index.json
+// ?category=<name>  -> <YOUTUBE_PLAYLISTS_BASE_URL>/<name>.json
+// ?search=1         -> <YOUTUBE_PLAYLISTS_BASE_URL>/_search.json
+// ?lookup=1         -> <YOUTUBE_PLAYLISTS_BASE_URL>/_lookup.json
+// (no params)       -> whole document from ?url= or YOUTUBE_PLAYLISTS_URL
+// Split files come from `generate_playlists.py --split`; add &v=<hash> from
+// index.json to get an immutable cache entry for that category (or for the
+// search index or video ID lookup, with the hash under "search" or
+// "lookup"). The entry is only immutable when v matches the file's current
+// content hash. Every response reports that hash in X-Content-Hash, so
+// clients can match a whole document to the playlists_search.json built
+// from it.
+import { createHash } from 'crypto';
+
 export default async function handler(req, res) {
-  const url = req.query.url || process.env.YOUTUBE_PLAYLISTS_URL;
+  const { category, index, search, lookup, v } = req.query;
+  let url;
+  if (category || index || search || lookup) {
+    const base = process.env.YOUTUBE_PLAYLISTS_BASE_URL;
+    if (!base) {
+      return res.status(404).json({ error: 'YOUTUBE_PLAYLISTS_BASE_URL env var not set' });
+    }
+    // Category shards never use these names; generate_playlists.py rejects them
+    if (category && ['index', '_search', '_lookup'].includes(category)) {
+      return res.status(400).json({ error: 'Reserved category name: ' + category });
+    }
+    const file = index ? 'index.json'
+      : search ? '_search.json'
+      : lookup ? '_lookup.json'
+      : encodeURIComponent(category) + '.json';
+    url = base.replace(/\/+$/, '') + '/' + file;
+  } else {
+    url = req.query.url || process.env.YOUTUBE_PLAYLISTS_URL;
+  }
   if (!url) {
     return res.status(400).json({ error: 'Missing ?url= parameter or YOUTUBE_PLAYLISTS_URL env var' });
   }
@@ -9,9 +41,18 @@ export default async function handler(req, res) {
     if (!response.ok) {
       return res.status(response.status).json({ error: 'Upstream error ' + response.status });
     }
-    const data = await response.json();
-    res.setHeader('Cache-Control', 's-maxage=60, stale-while-revalidate=300');
+    const body = Buffer.from(await response.arrayBuffer());
+    const data = JSON.parse(body.toString('utf8'));
+    // Same hash as index.json: first 16 hex chars of sha256 over the file bytes
+    const hash = createHash('sha256').update(body).digest('hex').slice(0, 16);
+    if ((category || search || lookup) && v && v === hash) {
+      res.setHeader('Cache-Control', 'public, s-maxage=31536000, max-age=31536000, immutable');
+    } else {
+      res.setHeader('Cache-Control', 's-maxage=60, stale-while-revalidate=300');
+    }
+    res.setHeader('X-Content-Hash', hash);
     res.setHeader('Access-Control-Allow-Origin', '*');
+    res.setHeader('Access-Control-Expose-Headers', 'X-Content-Hash');
     return res.status(200).json(data);
   } catch (e) {
     return res.status(500).json({ error: e.message });
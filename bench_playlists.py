@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Benchmark parse_playlist_file on large synthetic playlists.
+
+Writes a synthetic playlist (quoted and bare lines, with and without
+timestamps), parses it with the current parser and with the original
+regex-per-line parser kept below as a reference, and checks that both
+produce identical entries. The real playlist/*.txt files are checked too.
+
+Usage:
+  python bench_playlists.py
+  python bench_playlists.py -n 1000000 --times 8
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from generate_playlists import parse_playlist_file
+
+
+def reference_parse_playlist_file(filepath):
+    """Original parser, kept verbatim for parity checks."""
+    entries = []
+    with open(filepath, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            m = re.match(r'^([^,]*),\s*"(.+)"$', line)
+            if m:
+                name = m.group(1).strip()
+                inner = m.group(2).strip()
+                parts = [p.strip() for p in inner.split(',')]
+                url = parts[0]
+                times = []
+                for t in parts[1:]:
+                    if not t:
+                        continue
+                    tm = re.match(r'^([\d:]+)\s*(?:\(([^)]*)\))?(.*)$', t)
+                    if tm:
+                        time_str = tm.group(1)
+                        label = (tm.group(2) or '').strip()
+                        entry = {'time': time_str}
+                        if label:
+                            entry['label'] = label
+                        times.append(entry)
+            else:
+                parts = line.split(',', 1)
+                if len(parts) == 2:
+                    name = parts[0].strip()
+                    rest = parts[1].strip()
+                else:
+                    rest = parts[0].strip()
+                    name = ''
+                url = rest
+                times = []
+                is_url = bool(re.match(r'^https?://', rest))
+                if is_url:
+                    url_and_times = rest.split(',')
+                    trailing_times = []
+                    i = len(url_and_times) - 1
+                    while i > 0:
+                        candidate = url_and_times[i].strip()
+                        if re.match(r'^\d{1,2}:\d{2}', candidate):
+                            trailing_times.insert(0, candidate)
+                            i -= 1
+                        else:
+                            break
+                    if trailing_times:
+                        url = ','.join(url_and_times[:i + 1])
+                        for t in trailing_times:
+                            tm = re.match(r'^([\d:]+)\s*(?:\(([^)]*)\))?(.*)$', t)
+                            if tm:
+                                tentry = {'time': tm.group(1)}
+                                label = (tm.group(2) or '').strip()
+                                if label:
+                                    tentry['label'] = label
+                                times.append(tentry)
+            if not url:
+                continue
+            if not name:
+                name = url.rstrip('/').split('/')[-1]
+                name = name.split('?')[0]
+                if '.' in name:
+                    name = name.rsplit('.', 1)[0]
+                name = name.replace('_', ' ').replace('-', ' ').strip()
+            entry = {'name': name, 'url': url}
+            if times:
+                entry['times'] = times
+            entries.append(entry)
+    return entries
+
+
+def synthetic_line(rng, max_times):
+    vid = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyzABCDEFGHIJ0123456789_-') for _ in range(11))
+    url = f'https://www.youtube.com/watch?v={vid}'
+    times = []
+    for k in range(rng.randint(0, max_times)):
+        t = f'{rng.randint(0, 59)}:{rng.randint(0, 59):02d}'
+        if rng.random() < 0.5:
+            t += f'(part {k})'
+        times.append(t)
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f'track-{vid},"{",".join([url] + times)}"'
+    if kind == 1:
+        return ','.join([f'track-{vid}', url] + times)
+    if kind == 2:
+        return ','.join([url] + times)
+    if kind == 3:
+        return f'https://www.dropbox.com/scl/fi/{vid}/My_Song-{vid}.mp3?rlkey=x&raw=1'
+    return '# comment' if rng.random() < 0.5 else ''
+
+
+def timed(fn, path):
+    start = time.perf_counter()
+    result = fn(path)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the playlist line parser')
+    parser.add_argument('-n', '--lines', type=int, default=1_000_000,
+                        help='Synthetic lines to generate (default: 1000000)')
+    parser.add_argument('--times', type=int, default=4,
+                        help='Max timestamps per line (default: 4)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-i', '--input', default='playlist',
+                        help='Real playlist folder to parity-check (default: playlist)')
+    args = parser.parse_args()
+
+    failures = 0
+    for txt_file in sorted(Path(args.input).glob('*.txt')):
+        if parse_playlist_file(txt_file) != reference_parse_playlist_file(txt_file):
+            print(f'  MISMATCH: {txt_file}')
+            failures += 1
+    print(f'Parity on {args.input}/: {"FAIL" if failures else "ok"}')
+
+    rng = random.Random(args.seed)
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for _ in range(args.lines):
+                f.write(synthetic_line(rng, args.times) + '\n')
+        size_mb = os.path.getsize(path) / 1e6
+        print(f'\nSynthetic playlist: {args.lines:,} lines, {size_mb:.1f} MB')
+
+        new, t_new = timed(parse_playlist_file, path)
+        ref, t_ref = timed(reference_parse_playlist_file, path)
+        print(f'  reference: {t_ref:.2f}s ({args.lines / t_ref:,.0f} lines/s)')
+        print(f'  current:   {t_new:.2f}s ({args.lines / t_new:,.0f} lines/s)')
+        print(f'  speedup:   {t_ref / t_new:.2f}x')
+        if new != ref:
+            print('  MISMATCH on synthetic playlist')
+            failures += 1
+        else:
+            print(f'  parity ok ({len(new):,} entries)')
+    finally:
+        os.remove(path)
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
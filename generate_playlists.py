@@ -4,98 +4,352 @@
 Each .txt file becomes a category (filename stem = key).
 Each line in a .txt file: name,url  OR  just url (name auto-derived).
 
+With --split, also writes one <category>.json per category plus an
+index.json (name, count, content hash, file) so the viewer and
+api/playlists.js can fetch only the category being shown. The search
+index and video ID lookup are copied there as _search.json and
+_lookup.json, with their hashes in index.json, so they are served and
+versioned together with the category files.
+
 Usage:
   python generate_playlists.py
   python generate_playlists.py -i playlist -o public/playlists.json
+  python generate_playlists.py --split public/playlists
+  python generate_playlists.py --force
+
+Each entry also carries its provider ('youtube', 'dropbox' or 'url'), the
+YouTube video ID when there is one, and each time's offset in seconds
+(absent for times the viewer's parseTimeToSeconds would reject).
+A video ID -> [category, index] table is written next to the output
+(playlists_lookup.json) so the player can jump without parsing URLs.
+playlists_search.json holds a sorted term table over entry names and time
+labels; clients binary-search it for prefix matches instead of scanning
+every entry. Its "source" is the content hash of the playlists.json it
+indexes, so the viewer only uses it with the matching playlists.
+
+Source hashes and parsed entries are cached in playlist/.manifest.json,
+so only changed .txt files are reparsed. Output files are only rewritten
+(and upload commands only printed) when their bytes actually change.
 """
 
 import argparse
+import hashlib
 import json
 import re
 from pathlib import Path
 
 
+QUOTED_RE = re.compile(r'^([^,]*),\s*"(.+)"$')
+TIME_RE = re.compile(r'([\d:]+)\s*(?:\(([^)]*)\))?')
+TRAILING_TIME_RE = re.compile(r'\d{1,2}:\d{2}')
+SECONDS_RE = re.compile(r'^[0-9]+(?::[0-9]+){0,2}$')
+# Same rules as extractVideoId / isYouTubeURL in public/index.html
+VIDEO_ID_RE = re.compile(r'^.*(?:youtu\.be/|v/|u/\w/|embed/|shorts/|watch\?v=|&v=)([^#&?]*)')
+YOUTUBE_URL_RE = re.compile(
+    r'(?:https?://)?(?:(?:www\.)?youtube\.com/(?:watch\?v=|embed/|shorts/)|youtu\.be/)[a-zA-Z0-9_-]')
+
+SEARCH_TOKEN_RE = re.compile(r'[^\W_]+')
+# Extra files written next to the category shards with --split, keyed by
+# their entry in index.json
+SPLIT_EXTRA_FILES = {'search': '_search.json', 'lookup': '_lookup.json'}
+
+# Bump when parse_playlist_line or annotate_entry output changes so cached
+# entries are reparsed
+PARSER_VERSION = 3
+
+
+def parse_time_token(token):
+    """Parse '1:23' or '1:23(label)' into a times entry, or None."""
+    tm = TIME_RE.match(token)
+    if not tm:
+        return None
+    entry = {'time': tm.group(1)}
+    label = (tm.group(2) or '').strip()
+    if label:
+        entry['label'] = label
+    return entry
+
+
+def derive_name(url):
+    """Derive a display name from the last path segment of a URL."""
+    name = url.rstrip('/').split('/')[-1]
+    name = name.split('?')[0]
+    if '.' in name:
+        name = name.rsplit('.', 1)[0]
+    return name.replace('_', ' ').replace('-', ' ').strip()
+
+
+def parse_playlist_line(line):
+    """Parse one playlist line into an entry dict, or None if it has no URL.
+
+    Handles both forms the same way:
+      name,"url,time1,time2(label),..."
+      name,url,time1,time2(label),...   (or just url)
+    """
+    line = line.strip()
+    if not line or line[0] == '#':
+        return None
+    times = []
+    m = QUOTED_RE.match(line)
+    if m:
+        name = m.group(1).strip()
+        tokens = m.group(2).strip().split(',')
+        url = tokens[0].strip()
+        for t in tokens[1:]:
+            t = t.strip()
+            if t:
+                tentry = parse_time_token(t)
+                if tentry:
+                    times.append(tentry)
+    else:
+        name, sep, rest = line.partition(',')
+        if sep:
+            name = name.strip()
+            rest = rest.strip()
+        else:
+            name, rest = '', name
+        url = rest
+        if rest.startswith(('http://', 'https://')):
+            # Walk trailing timestamps back from the end, then restore order
+            tokens = rest.split(',')
+            i = len(tokens) - 1
+            while i > 0:
+                candidate = tokens[i].strip()
+                if not TRAILING_TIME_RE.match(candidate):
+                    break
+                times.append(parse_time_token(candidate))
+                i -= 1
+            if times:
+                times.reverse()
+                url = ','.join(tokens[:i + 1])
+    if not url:
+        return None
+    entry = {'name': name or derive_name(url), 'url': url}
+    if times:
+        entry['times'] = times
+    return entry
+
+
+def time_to_seconds(time_str):
+    """Convert '83', '1:23' or '1:02:03' to integer seconds, or None.
+
+    Same rules as parseTimeToSeconds in public/index.html: minutes and
+    seconds after the first field must be below 60.
+    """
+    time_str = time_str.strip()
+    if not SECONDS_RE.match(time_str):
+        return None
+    values = [int(part) for part in time_str.split(':')]
+    if any(value >= 60 for value in values[1:]):
+        return None
+    seconds = 0
+    for value in values:
+        seconds = seconds * 60 + value
+    return seconds
+
+
+def video_id(url):
+    """Return the 11-character YouTube video ID in url, or None."""
+    if not YOUTUBE_URL_RE.search(url):
+        return None
+    m = VIDEO_ID_RE.match(url)
+    if m and len(m.group(1)) == 11:
+        return m.group(1)
+    return None
+
+
+def annotate_entry(entry):
+    """Add provider, YouTube id and per-time seconds to a parsed entry."""
+    vid = video_id(entry['url'])
+    if vid:
+        entry['provider'] = 'youtube'
+        entry['id'] = vid
+    elif 'dropbox.com/' in entry['url']:
+        entry['provider'] = 'dropbox'
+    else:
+        entry['provider'] = 'url'
+    for t in entry.get('times', ()):
+        seconds = time_to_seconds(t['time'])
+        if seconds is not None:
+            t['seconds'] = seconds
+    return entry
+
+
+def build_video_lookup(playlists):
+    """Map each YouTube id to [category, index] of its first occurrence."""
+    lookup = {}
+    for category, entries in playlists.items():
+        for i, entry in enumerate(entries):
+            vid = entry.get('id')
+            if vid and vid not in lookup:
+                lookup[vid] = [category, i]
+    return lookup
+
+
+def build_search_index(playlists, source=None):
+    """Build a prefix search index over entry names and time labels.
+
+    docs holds [category, entry index, text] for names and
+    [category, entry index, text, time index] for labels. terms is the
+    sorted list of lowercase tokens and postings[k] the sorted doc ids
+    containing terms[k], so a prefix query is a binary search over terms
+    followed by a walk while terms still start with the prefix. source is
+    the content hash of the playlists.json the index was built from.
+    """
+    categories = list(playlists)
+    docs = []
+    term_docs = {}
+
+    def add(text, doc):
+        doc_id = len(docs)
+        docs.append(doc)
+        for token in set(SEARCH_TOKEN_RE.findall(text.lower())):
+            term_docs.setdefault(token, []).append(doc_id)
+
+    for c, entries in enumerate(playlists.values()):
+        for i, entry in enumerate(entries):
+            add(entry['name'], [c, i, entry['name']])
+            for t, tentry in enumerate(entry.get('times', ())):
+                if tentry.get('label'):
+                    add(tentry['label'], [c, i, tentry['label'], t])
+
+    terms = sorted(term_docs)
+    return {
+        'source': source,
+        'categories': categories,
+        'docs': docs,
+        'terms': terms,
+        'postings': [term_docs[term] for term in terms],
+    }
+
+
 def parse_playlist_file(filepath):
     entries = []
     with open(filepath, 'r', encoding='utf-8-sig') as f:
         for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            # Check for quoted value: name,"url,time1,time2(label),..."
-            m = re.match(r'^([^,]*),\s*"(.+)"$', line)
-            if m:
-                name = m.group(1).strip()
-                inner = m.group(2).strip()
-                parts = [p.strip() for p in inner.split(',')]
-                url = parts[0]
-                times = []
-                for t in parts[1:]:
-                    if not t:
-                        continue
-                    tm = re.match(r'^([\d:]+)\s*(?:\(([^)]*)\))?(.*)$', t)
-                    if tm:
-                        time_str = tm.group(1)
-                        label = (tm.group(2) or '').strip()
-                        entry = {'time': time_str}
-                        if label:
-                            entry['label'] = label
-                        times.append(entry)
-            else:
-                parts = line.split(',', 1)
-                if len(parts) == 2:
-                    name = parts[0].strip()
-                    rest = parts[1].strip()
-                else:
-                    rest = parts[0].strip()
-                    name = ''
-                url = rest
-                times = []
-                # Check if rest contains inline timestamps after URL
-                is_url = bool(re.match(r'^https?://', rest))
-                if is_url:
-                    url_and_times = rest.split(',')
-                    trailing_times = []
-                    i = len(url_and_times) - 1
-                    while i > 0:
-                        candidate = url_and_times[i].strip()
-                        if re.match(r'^\d{1,2}:\d{2}', candidate):
-                            trailing_times.insert(0, candidate)
-                            i -= 1
-                        else:
-                            break
-                    if trailing_times:
-                        url = ','.join(url_and_times[:i + 1])
-                        for t in trailing_times:
-                            tm = re.match(r'^([\d:]+)\s*(?:\(([^)]*)\))?(.*)$', t)
-                            if tm:
-                                tentry = {'time': tm.group(1)}
-                                label = (tm.group(2) or '').strip()
-                                if label:
-                                    tentry['label'] = label
-                                times.append(tentry)
-            if not url:
-                continue
-            if not name:
-                # Derive name from URL
-                name = url.rstrip('/').split('/')[-1]
-                name = name.split('?')[0]
-                if '.' in name:
-                    name = name.rsplit('.', 1)[0]
-                name = name.replace('_', ' ').replace('-', ' ').strip()
-            entry = {'name': name, 'url': url}
-            if times:
-                entry['times'] = times
-            entries.append(entry)
+            entry = parse_playlist_line(line)
+            if entry is not None:
+                entries.append(entry)
     return entries
 
 
+def load_manifest(path):
+    """Return {filename: {'hash', 'entries'}} from the manifest, or {}."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != PARSER_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+
+def load_playlists(txt_files, cached):
+    """Parse txt_files, reusing cached entries for files whose hash matches.
+
+    Returns (playlists, files) where files is the new manifest body.
+    """
+    playlists = {}
+    files = {}
+    for txt_file in txt_files:
+        category = txt_file.stem
+        digest = hashlib.sha256(txt_file.read_bytes()).hexdigest()
+        hit = cached.get(txt_file.name)
+        if hit and hit.get('hash') == digest:
+            entries = hit['entries']
+            status = 'unchanged'
+        else:
+            entries = [annotate_entry(e) for e in parse_playlist_file(txt_file)]
+            status = 'parsed'
+        playlists[category] = entries
+        files[txt_file.name] = {'hash': digest, 'entries': entries}
+        print(f'  {category}: {len(entries)} item(s) ({status})')
+    return playlists, files
+
+
+def write_if_changed(path, data):
+    """Write bytes to path unless it already holds exactly those bytes."""
+    path = Path(path)
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def write_split(playlists, out_dir, extras=None):
+    """Write one compact JSON file per category plus index.json.
+
+    Returns (index, changed) where changed counts files actually rewritten
+    or removed. Each index entry carries the shard's content hash so clients
+    can cache shards by hash. extras ({'search': ..., 'lookup': ...}) are
+    written to their SPLIT_EXTRA_FILES name and listed under index[key] the
+    same way. Shards of categories listed in the previous index.json but
+    gone now are deleted. Raises ValueError, before writing anything, for a
+    category whose shard would overwrite index.json or an extra file.
+    """
+    out_dir = Path(out_dir)
+    reserved = {'index.json', *SPLIT_EXTRA_FILES.values()}
+    clashes = [c for c in playlists if f'{c}.json' in reserved]
+    if clashes:
+        raise ValueError(f'playlist name(s) {", ".join(clashes)} clash with split files '
+                         f'{", ".join(sorted(reserved))}; rename the .txt file(s)')
+    try:
+        previous = json.loads((out_dir / 'index.json').read_text(encoding='utf-8'))
+        previous_files = {c['file'] for c in previous.get('categories', [])}
+    except (OSError, ValueError, KeyError, TypeError):
+        previous_files = set()
+    categories = []
+    changed = 0
+    for category, entries in playlists.items():
+        data = json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        filename = f'{category}.json'
+        changed += write_if_changed(out_dir / filename, data)
+        categories.append({
+            'name': category,
+            'count': len(entries),
+            'hash': hashlib.sha256(data).hexdigest()[:16],
+            'file': filename,
+        })
+    index = {'categories': categories}
+    for key, value in (extras or {}).items():
+        filename = SPLIT_EXTRA_FILES[key]
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        changed += write_if_changed(out_dir / filename, data)
+        index[key] = {'hash': hashlib.sha256(data).hexdigest()[:16], 'file': filename}
+    data = json.dumps(index, indent=2, ensure_ascii=False).encode('utf-8')
+    changed += write_if_changed(out_dir / 'index.json', data)
+
+    current_files = {c['file'] for c in categories}
+    for filename in previous_files - current_files:
+        stale = out_dir / Path(filename).name
+        if stale.name not in reserved and stale.exists():
+            stale.unlink()
+            changed += 1
+    return index, changed
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate playlists.json from .txt files')
     parser.add_argument('-i', '--input', default='playlist',
                         help='Input folder containing .txt files (default: playlist)')
     parser.add_argument('-o', '--output', default='public/playlists.json',
                         help='Output JSON file (default: public/playlists.json)')
+    parser.add_argument('--split', nargs='?', const='public/playlists', metavar='DIR',
+                        help='Also write per-category files and index.json to DIR '
+                             '(default: public/playlists)')
+    parser.add_argument('--lookup', default=None,
+                        help='Video ID lookup JSON (default: <output stem>_lookup.json)')
+    parser.add_argument('--search', default=None,
+                        help='Search index JSON (default: <output stem>_search.json)')
+    parser.add_argument('--manifest', default=None,
+                        help='Source hash manifest (default: <input>/.manifest.json)')
+    parser.add_argument('--force', action='store_true',
+                        help='Ignore the manifest and reparse every file')
     args = parser.parse_args()
 
     input_dir = Path(args.input)
@@ -108,28 +362,59 @@ def main():
         print(f'No .txt files found in {input_dir}')
         return 1
 
-    playlists = {}
-    for txt_file in txt_files:
-        category = txt_file.stem
-        entries = parse_playlist_file(txt_file)
-        playlists[category] = entries
-        print(f'  {category}: {len(entries)} item(s)')
+    manifest_path = Path(args.manifest) if args.manifest else input_dir / '.manifest.json'
+    cached = {} if args.force else load_manifest(manifest_path)
+    playlists, files = load_playlists(txt_files, cached)
+    manifest = {'version': PARSER_VERSION, 'files': files}
+    write_if_changed(manifest_path, json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
 
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(playlists, indent=2, ensure_ascii=False).encode('utf-8')
+    output_changed = write_if_changed(output_path, data)
+    playlists_hash = hashlib.sha256(data).hexdigest()[:16]
+    if output_changed:
+        print(f'\n-> Wrote {len(playlists)} categories to {output_path}')
+    else:
+        print(f'\n-> {output_path} unchanged')
+
+    lookup = build_video_lookup(playlists)
+    lookup_path = Path(args.lookup) if args.lookup else output_path.with_name(f'{output_path.stem}_lookup.json')
+    data = json.dumps(lookup, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if write_if_changed(lookup_path, data):
+        print(f'-> Wrote {len(lookup)} video IDs to {lookup_path}')
+
+    search = build_search_index(playlists, playlists_hash)
+    search_path = Path(args.search) if args.search else output_path.with_name(f'{output_path.stem}_search.json')
+    data = json.dumps(search, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if write_if_changed(search_path, data):
+        print(f'-> Wrote {len(search["terms"])} search terms to {search_path}')
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(playlists, f, indent=2, ensure_ascii=False)
+    split_changed = 0
+    if args.split:
+        extras = {'search': search, 'lookup': lookup}
+        try:
+            _, split_changed = write_split(playlists, args.split, extras)
+        except ValueError as e:
+            print(f'--split: {e}')
+            return 1
+        print(f'-> {split_changed} of {len(playlists) + len(extras) + 1} split file(s) changed in {args.split}/')
 
-    print(f'\n-> Wrote {len(playlists)} categories to {output_path}')
+    if not output_changed and not split_changed:
+        print('\nNothing changed; no upload needed.')
+        return 0
 
-    # Print commands to sync to Dropbox and update Vercel env var
-    base = Path(__file__).resolve().parent / 'public'
-    print(f'\nrclone copyto {base / "playlists.json"}  dropbox:/vercel/youtube_playlist.json')
-    print(f'rclone link dropbox:/vercel/youtube_playlist.json')
-    print(f'\n# Then update Vercel with the link (append &raw=1):')
-    print(f'vercel env rm YOUTUBE_PLAYLISTS_URL production -y')
-    print(f'echo "<LINK>&raw=1" | vercel env add YOUTUBE_PLAYLISTS_URL production')
+    if output_changed:
+        # Print commands to sync to Dropbox and update Vercel env var
+        base = Path(__file__).resolve().parent / 'public'
+        print(f'\nrclone copyto {base / "playlists.json"}  dropbox:/vercel/youtube_playlist.json')
+        print(f'rclone link dropbox:/vercel/youtube_playlist.json')
+        print(f'\n# Then update Vercel with the link (append &raw=1):')
+        print(f'vercel env rm YOUTUBE_PLAYLISTS_URL production -y')
+        print(f'echo "<LINK>&raw=1" | vercel env add YOUTUBE_PLAYLISTS_URL production')
+    if split_changed:
+        split_dir = Path(args.split).resolve()
+        print(f'\n# Split files: serve {split_dir} from a static host, then')
+        print(f'echo "<BASE_URL>" | vercel env add YOUTUBE_PLAYLISTS_BASE_URL production')
     return 0
 
 
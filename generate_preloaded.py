@@ -8,15 +8,87 @@ and generates JSON files in ./public/preloaded/ that the React app can fetch.
 
 Usage:
     python generate_preloaded.py
+    python generate_preloaded.py --lazy
+    python generate_preloaded.py --force
+
+Source hashes are cached in ./preloaded_reports/.manifest.json; only folders
+whose files changed are rebuilt, and an unchanged tree causes no writes.
 
 Output:
-    ./public/preloaded/index.json - List of available folders
+    ./public/preloaded/index.json - List of available folders, with per-file
+        metadata (size, hash, title, first heading)
     ./public/preloaded/<folder_name>.json - Contents of each folder
+    ./public/preloaded/<folder_name>/<file> - With --lazy, each file body is
+        written on its own instead of <folder_name>.json, so a client can list
+        a folder from index.json and fetch only the file that is opened
+    ./public/preloaded/<folder_name>/<file>.chunks.json - With --chunk-size N,
+        files larger than N bytes are streamed into ~N-character chunks cut at
+        chapter or paragraph boundaries (<file>.chunks/00000.txt, ...). The
+        chunk table lists each chunk's offset, length and chapter titles.
+    ./public/preloaded/search/ - With --search, an inverted index over every
+        file (stemmed term -> file, paragraph offset), sharded by the first two
+        characters of the term so a query only fetches the shards it needs
+    ./public/preloaded/<folder_name>/<file>.md.html - With --render-md, each .md
+        report pre-rendered to an HTML fragment; index.json gets its path and a
+        table of contents. Renders are cached by source hash in
+        ./preloaded_reports/.render_cache/
+    ./public/preloaded/blobs/<sha256>.txt - With --blobs, every file body is
+        stored once under its content hash and index.json refers to it by
+        'blob' path, so copies shared between folders are written (and
+        downloaded) once; blobs never change and can be cached as immutable
 """
 
 import os
+import re
 import json
+import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from html import escape, unescape
+
+from process_texts import (parse_code_blocks, parse_markdown_headings,
+                           parse_markdown_images, parse_markdown_links)
+
+HEADING_RE = re.compile(r'^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$', re.MULTILINE)
+TOKEN_RE = re.compile(r'[^\W_]+')
+SEARCH_PREFIX_LEN = 2
+STEMMER_VERSION = 'light-2'
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no nor
+not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves
+""".split())
+# (suffix, replacement, minimum stem length), first match wins
+STEM_RULES = (
+    ('ational', 'ate', 2), ('ization', 'ize', 2), ('fulness', 'ful', 2),
+    ('ousness', 'ous', 2), ('iveness', 'ive', 2), ('ements', '', 3),
+    ('ement', '', 3), ('ments', '', 3), ('ment', '', 3), ('ingly', '', 3),
+    ('edly', '', 3), ('ies', 'y', 2), ('sses', 'ss', 2), ('ness', '', 3),
+    ('ing', '', 3), ('ed', '', 3), ('ly', '', 3), ('es', '', 3), ('s', '', 3),
+)
+# Words ending in these are left alone when their rule matches ("glass")
+STEM_EXCEPTIONS = {'s': ('ss', 'us', 'is')}
+# After these suffixes a doubled final consonant is undoubled ("running" ->
+# "run"), if the stem is longer than STEM_UNDOUBLE_MIN and the letter isn't in
+# STEM_UNDOUBLE_KEEP
+STEM_UNDOUBLE = ('ing', 'ed', 'edly', 'ingly')
+STEM_UNDOUBLE_MIN = 3
+STEM_UNDOUBLE_KEEP = 'aeiouslz'
+RENDER_VERSION = 2
+CODE_BLOCK_RE = re.compile(r'```(\w+)?\n(.*?)```', re.DOTALL)
+# Same pattern as process_texts.parse_markdown_images
+MEDIA_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+BLOCK_REF_RE = re.compile('\x00(\\d+)\x00')
+HTML_HEADING_RE = re.compile(r'^<h([1-6])>(.*)</h\1>$')
+LIST_ITEM_RE = re.compile(r'^(\s*)([-*+]|\d+\.)\s+(.*)$')
+HR_RE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+CHAPTER_RE = re.compile(r'^\s*(?:(?:CHAPTER|Chapter|BOOK|Book|PART|Part|VOLUME|Volume)\s+[\dIVXLCDM]+\b|#{1,3}\s+\S)')
 
 def process_file(file_path):
     """Read a file and return its content."""
@@ -27,18 +99,554 @@ def process_file(file_path):
         print(f"  Warning: Could not read {file_path}: {e}")
         return None
 
-def generate_preloaded_reports(input_dir='./preloaded_reports', output_dir='./public/preloaded'):
-    """Generate JSON files from preloaded report folders."""
+def file_title(filename):
+    """Turn a filename like 'white_bread_inflammation.md' into a title."""
+    stem = filename
+    while os.path.splitext(stem)[1] in ('.md', '.txt'):
+        stem = os.path.splitext(stem)[0]
+    title = stem.replace('_', ' ').replace('-', ' ').strip()
+    return title or filename
 
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+def first_heading(content):
+    """Return the first markdown heading, else the first non-empty line."""
+    m = HEADING_RE.search(content)
+    if m:
+        return m.group(1)
+    for line in content.splitlines():
+        line = line.strip().lstrip('\ufeff')
+        if line:
+            return line[:120]
+    return ''
+
+def file_metadata(filename, content):
+    """Build the index.json entry describing one file."""
+    data = content.encode('utf-8')
+    return {
+        'name': filename,
+        'size': len(data),
+        'hash': hashlib.sha256(data).hexdigest()[:16],
+        'title': file_title(filename),
+        'heading': first_heading(content),
+    }
+
+def iter_chunks(file_path, chunk_size):
+    """Stream a text file as (text, title, chapters) chunks of ~chunk_size chars.
+
+    A chunk is cut before a chapter heading once it is at least half full,
+    or at the first paragraph break after it is full (hard cap 2x). title is
+    the chapter in effect where the chunk starts; chapters lists headings
+    that begin inside it.
+    """
+    lines = []
+    size = 0
+    title = ''
+    chunk_title = ''
+    chapters = []
+    prev_blank = False
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            blank = not line.strip()
+            heading = not blank and CHAPTER_RE.match(line)
+            if lines and ((heading and size >= chunk_size // 2)
+                          or (size >= chunk_size and prev_blank and not blank)
+                          or size >= 2 * chunk_size):
+                yield ''.join(lines), chunk_title, chapters
+                lines, size, chapters = [], 0, []
+            if not lines:
+                chunk_title = title
+            if heading:
+                title = line.strip().lstrip('#').strip()
+                chapters.append(title)
+                if size == 0:
+                    chunk_title = title
+            lines.append(line)
+            size += len(line)
+            prev_blank = blank
+    if lines:
+        yield ''.join(lines), chunk_title, chapters
+
+def write_chunked(file_path, folder_name, filename, output_dir, chunk_size):
+    """Write a large file as chunk files plus a chunk table.
+
+    Returns the index.json metadata for the file. Only one chunk is held in
+    memory at a time.
+    """
+    rel_dir = f"{folder_name}/{filename}.chunks"
+    chunk_dir = os.path.join(output_dir, folder_name, f"{filename}.chunks")
+    os.makedirs(chunk_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    table = []
+    offset = 0
+    size = 0
+    heading = None
+    first_chunk = ''
+    for i, (text, title, chapters) in enumerate(iter_chunks(file_path, chunk_size)):
+        data = text.encode('utf-8')
+        digest.update(data)
+        size += len(data)
+        if i == 0:
+            first_chunk = text
+        if heading is None:
+            m = HEADING_RE.search(text)
+            heading = m.group(1) if m else None
+        chunk_name = f"{i:05d}.txt"
+        with open(os.path.join(chunk_dir, chunk_name), 'wb') as f:
+            f.write(data)
+        table.append({
+            'path': f"{rel_dir}/{chunk_name}",
+            'offset': offset,
+            'length': len(text),
+            'title': title,
+            'chapters': chapters,
+        })
+        offset += len(text)
+
+    # A file that shrank leaves higher-numbered chunks from the last build behind
+    for name in os.listdir(chunk_dir):
+        base, ext = os.path.splitext(name)
+        if ext == '.txt' and base.isdigit() and int(base) >= len(table):
+            os.remove(os.path.join(chunk_dir, name))
+
+    table_path = os.path.join(output_dir, folder_name, f"{filename}.chunks.json")
+    with open(table_path, 'w', encoding='utf-8') as f:
+        json.dump({'name': filename, 'length': offset, 'chunks': table}, f, ensure_ascii=False)
+
+    return {
+        'name': filename,
+        'size': size,
+        'hash': digest.hexdigest()[:16],
+        'title': file_title(filename),
+        'heading': heading if heading is not None else first_heading(first_chunk),
+        'chunks': f"{rel_dir}.json",
+        'chunkCount': len(table),
+    }, offset
+
+def stem(word):
+    """Light suffix-stripping stemmer; clients apply the same rules from
+    search/index.json (see stem_rules_json)."""
+    for suffix, replacement, min_len in STEM_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_len:
+            if word.endswith(STEM_EXCEPTIONS.get(suffix, ())):
+                return word
+            word = word[:len(word) - len(suffix)] + replacement
+            if suffix in STEM_UNDOUBLE and len(word) > STEM_UNDOUBLE_MIN \
+                    and word[-1] == word[-2] and word[-1] not in STEM_UNDOUBLE_KEEP:
+                word = word[:-1]
+            return word
+    return word
+
+def stem_rules_json():
+    """The complete stemmer as data, for search/index.json."""
+    return {
+        'rules': [list(rule) for rule in STEM_RULES],
+        'exceptions': {suffix: list(endings) for suffix, endings in STEM_EXCEPTIONS.items()},
+        'undouble': list(STEM_UNDOUBLE),
+        'undoubleMinLength': STEM_UNDOUBLE_MIN,
+        'undoubleKeep': STEM_UNDOUBLE_KEEP,
+    }
+
+def search_terms(text):
+    """Lowercase, drop stop words and one-character tokens, then stem."""
+    for token in TOKEN_RE.findall(text.lower()):
+        if len(token) > 1 and token not in STOP_WORDS:
+            yield stem(token)
+
+def iter_paragraphs(file_path):
+    """Yield (offset, text) for each blank-line separated paragraph, streaming."""
+    offset = 0
+    start = 0
+    lines = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                if not lines:
+                    start = offset
+                lines.append(line)
+            elif lines:
+                yield start, ''.join(lines)
+                lines = []
+            offset += len(line)
+    if lines:
+        yield start, ''.join(lines)
+
+def build_search_index(input_dir, folders, output_dir, prefix_len=SEARCH_PREFIX_LEN):
+    """Write an inverted index over all files to <output_dir>/search/.
+
+    search/index.json lists the files ([folder, name]) and the shards.
+    search/<prefix>.json maps each term starting with <prefix> to postings
+    [[file id, paragraph offset, ...], ...]; offsets are character offsets
+    of paragraph starts within the file (same units as the chunk table).
+    """
+    files = []
+    postings = {}
+    for entry in folders:
+        for meta in entry['files']:
+            file_id = len(files)
+            files.append([entry['name'], meta['name']])
+            file_path = os.path.join(input_dir, entry['name'], meta['name'])
+            for offset, text in iter_paragraphs(file_path):
+                for term in set(search_terms(text)):
+                    by_file = postings.setdefault(term, {})
+                    by_file.setdefault(file_id, []).append(offset)
+
+    shards = {}
+    for term in sorted(postings):
+        key = term[:prefix_len]
+        shards.setdefault(key, {})[term] = [[file_id] + offsets
+                                           for file_id, offsets in postings[term].items()]
+
+    search_dir = os.path.join(output_dir, 'search')
+    os.makedirs(search_dir, exist_ok=True)
+    shard_info = {}
+    for key, terms in shards.items():
+        data = json.dumps(terms, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        write_if_changed(os.path.join(search_dir, f"{key}.json"), data)
+        shard_info[key] = {'terms': len(terms), 'size': len(data)}
+
+    # Drop shards for prefixes that no longer occur
+    for name in os.listdir(search_dir):
+        if name.endswith('.json') and name != 'index.json' and name[:-5] not in shard_info:
+            os.remove(os.path.join(search_dir, name))
+
+    index = {
+        'stemmer': STEMMER_VERSION,
+        'prefixLength': prefix_len,
+        'stopWords': sorted(STOP_WORDS),
+        'stemRules': stem_rules_json(),
+        'files': files,
+        'shards': shard_info,
+    }
+    data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    write_if_changed(os.path.join(search_dir, 'index.json'), data)
+    return len(postings), len(shard_info)
+
+def slugify(text, seen):
+    """Make a unique id for a heading from its plain text."""
+    slug = re.sub(r'[^\w]+', '-', text.lower()).strip('-') or 'section'
+    base, n = slug, 2
+    while slug in seen:
+        slug = f"{base}-{n}"
+        n += 1
+    seen.add(slug)
+    return slug
+
+def render_inline(text):
+    """Bold, emphasis and inline code on already-escaped text.
+
+    Tags already in text (links) are set aside first, so their attributes
+    are never rewritten.
+    """
+    tags = []
+
+    def stash(match):
+        tags.append(match.group(0))
+        return f"\x01{len(tags) - 1}\x01"
+
+    text = HTML_TAG_RE.sub(stash, text)
+    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])', r'<em>\1</em>', text)
+    return re.sub('\x01(\\d+)\x01', lambda m: tags[int(m.group(1))], text)
+
+def render_markdown(content):
+    """Render a markdown report to an HTML fragment plus a table of contents.
+
+    Headings, links, images and code blocks go through the process_texts
+    converters; paragraphs, lists, rules and emphasis are handled here.
+    Returns (html, toc) where toc is a list of {level, text, id}.
+    """
+    blocks = []
+
+    def stash(html):
+        blocks.append(html)
+        return f"\x00{len(blocks) - 1}\x00"
+
+    # Code blocks and media render to block elements; they are stashed so
+    # they are emitted between paragraphs rather than inside them
+    text = CODE_BLOCK_RE.sub(lambda m: stash(parse_code_blocks(m.group(0))), content.lstrip('\ufeff'))
+    text = MEDIA_RE.sub(lambda m: stash(parse_markdown_images(m.group(0))), escape(text, quote=False))
+    text = parse_markdown_headings(parse_markdown_links(text))
+
+    out = []
+    toc = []
+    seen = set()
+    paragraph = []
+    list_tag = None
+
+    def flush():
+        nonlocal list_tag
+        if paragraph:
+            out.append('<p>' + '<br>\n'.join(render_inline(l) for l in paragraph) + '</p>')
+            paragraph.clear()
+        if list_tag:
+            out.append(f'</{list_tag}>')
+            list_tag = None
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+        heading = HTML_HEADING_RE.match(stripped)
+        item = LIST_ITEM_RE.match(line)
+        if not stripped:
+            # Close the paragraph but keep a list open across blank lines
+            if paragraph:
+                flush()
+        elif heading:
+            flush()
+            level, title = int(heading.group(1)), heading.group(2)
+            plain = unescape(HTML_TAG_RE.sub('', BLOCK_REF_RE.sub('', render_inline(title)))).strip()
+            slug = slugify(plain, seen)
+            toc.append({'level': level, 'text': plain, 'id': slug})
+            out.append(f'<h{level} id="{slug}">{render_inline(title)}</h{level}>')
+        elif HR_RE.match(stripped):
+            flush()
+            out.append('<hr>')
+        elif item:
+            tag = 'ol' if item.group(2)[0].isdigit() else 'ul'
+            if paragraph or list_tag != tag:
+                flush()
+                out.append(f'<{tag}>')
+                list_tag = tag
+            out.append(f'<li>{render_inline(item.group(3))}</li>')
+        elif stripped.startswith('&gt;'):
+            flush()
+            out.append(f'<blockquote>{render_inline(stripped[4:].strip())}</blockquote>')
+        elif list_tag and line[:1].isspace():
+            out[-1] = out[-1][:-5] + ' ' + render_inline(stripped) + '</li>'
+        else:
+            if list_tag:
+                flush()
+            # Text around a stashed block stays in paragraphs; the block goes between them
+            for i, part in enumerate(BLOCK_REF_RE.split(stripped)):
+                if i % 2:
+                    flush()
+                    out.append(blocks[int(part)])
+                elif part.strip():
+                    paragraph.append(part.strip())
+    flush()
+    # Blocks stashed inside list items, quotes and headings
+    html_out = BLOCK_REF_RE.sub(lambda m: blocks[int(m.group(1))], '\n'.join(out))
+    return html_out, toc
+
+def render_markdown_cached(content, cache_dir):
+    """render_markdown, reusing <cache_dir>/<source hash>.json when present."""
+    key = hashlib.sha256(f"{RENDER_VERSION}\n{content}".encode('utf-8')).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    if cache_path:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            return cached['html'], cached['toc']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # missing or unreadable entry: render again
+    html_out, toc = render_markdown(content)
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Workers may render the same article at once; rename makes the write atomic
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'html': html_out, 'toc': toc}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    return html_out, toc
+
+def list_text_files(folder_path):
+    """Return the folder's .txt and .md filenames, sorted case-insensitively."""
+    text_files = [f for f in os.listdir(folder_path) if f.endswith('.txt') or f.endswith('.md')]
+    text_files.sort(key=lambda x: x.lower())
+    return text_files
+
+def source_state(folder_path, text_files, previous):
+    """Return {filename: {'size', 'mtime', 'hash'}} for a folder's sources.
+
+    Files whose size and mtime match the previous manifest keep their
+    recorded hash without being read again.
+    """
+    state = {}
+    for filename in text_files:
+        file_path = os.path.join(folder_path, filename)
+        st = os.stat(file_path)
+        prev = previous.get(filename)
+        if prev and prev['size'] == st.st_size and prev['mtime'] == st.st_mtime_ns:
+            digest = prev['hash']
+        else:
+            h = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    h.update(block)
+            digest = h.hexdigest()
+        state[filename] = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'hash': digest}
+    return state
+
+def write_if_changed(path, data):
+    """Write bytes to path unless it already holds exactly those bytes."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+def load_manifest(path):
+    """Load the source manifest written by a previous run, or return {}."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build_folder(folder_name, folder_path, text_files, output_dir, lazy=False, chunk_size=0,
+                 render_cache=None, blobs=False, log=print):
+    """Write one folder's output and return its index.json entry, or None.
+
+    render_cache is the .render_cache directory when --render-md is on.
+    With blobs=True bodies go to the shared blob store instead of the
+    folder (see write_blob).
+    <folder>.json is streamed one file at a time (same bytes as json.dump
+    with indent=2), so only one file body is in memory at once.
+    """
+    files_meta = []
+    file_count = 0
+    bundled = 0
+    folder_json_path = os.path.join(output_dir, f"{folder_name}.json")
+    bundle = None if lazy or blobs else open(folder_json_path + '.tmp', 'w', encoding='utf-8')
+    blob_dir = os.path.join(output_dir, 'blobs')
+    if blobs:
+        os.makedirs(blob_dir, exist_ok=True)
+    try:
+        for filename in text_files:
+            file_path = os.path.join(folder_path, filename)
+            if chunk_size and os.path.getsize(file_path) > chunk_size:
+                try:
+                    meta, length = write_chunked(file_path, folder_name, filename, output_dir, chunk_size)
+                except Exception as e:
+                    log(f"  Warning: Could not read {file_path}: {e}")
+                    continue
+                files_meta.append(meta)
+                file_count += 1
+                log(f"  - {filename} ({length:,} chars, {meta['chunkCount']} chunks)")
+                continue
+
+            content = process_file(file_path)
+
+            if content is not None:
+                meta = file_metadata(filename, content)
+                if blobs:
+                    meta['blob'] = f"blobs/{write_blob(blob_dir, content)}"
+                elif lazy:
+                    # Same bytes the JSON string would decode to
+                    body_path = os.path.join(output_dir, folder_name, filename)
+                    os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                    with open(body_path, 'w', encoding='utf-8', newline='') as f:
+                        f.write(content)
+                    meta['path'] = f"{folder_name}/{filename}"
+                else:
+                    bundle.write(',\n  ' if bundled else '{\n  ')
+                    bundled += 1
+                    bundle.write(json.dumps(filename, ensure_ascii=False) + ': ')
+                    bundle.write(json.dumps(content, ensure_ascii=False))
+                if render_cache is not None and filename.endswith('.md'):
+                    html_out, toc = render_markdown_cached(content, render_cache)
+                    html_path = os.path.join(output_dir, folder_name, f"{filename}.html")
+                    os.makedirs(os.path.dirname(html_path), exist_ok=True)
+                    write_if_changed(html_path, html_out.encode('utf-8'))
+                    meta['html'] = f"{folder_name}/{filename}.html"
+                    meta['toc'] = toc
+                files_meta.append(meta)
+                file_count += 1
+                log(f"  - {filename} ({len(content):,} chars)")
+        if bundle:
+            bundle.write('\n}' if bundled else '{}')
+    finally:
+        if bundle:
+            bundle.close()
+
+    if file_count == 0:
+        if bundle:
+            os.remove(folder_json_path + '.tmp')
+        log(f"  No .txt or .md files found, skipping.")
+        return None
+
+    if blobs:
+        log(f"  Stored {file_count} file(s) in {blob_dir}")
+    elif lazy:
+        log(f"  Saved {file_count} file(s) to {os.path.join(output_dir, folder_name)}")
+    else:
+        # Save folder contents to JSON
+        os.replace(folder_json_path + '.tmp', folder_json_path)
+        log(f"  Saved to {folder_json_path}")
+
+    return {
+        'name': folder_name,
+        'fileCount': file_count,
+        'files': files_meta
+    }
+
+def write_blob(blob_dir, content):
+    """Store content under its SHA-256 in blob_dir; return the blob filename."""
+    data = content.encode('utf-8')
+    blob_name = f"{hashlib.sha256(data).hexdigest()}.txt"
+    blob_path = os.path.join(blob_dir, blob_name)
+    if not os.path.exists(blob_path):
+        # Other workers may write the same blob; rename makes it atomic
+        tmp_path = f"{blob_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, blob_path)
+    return blob_name
+
+def _build_folder_job(args):
+    """Run build_folder in a worker, returning (entry, log lines) for the parent to print."""
+    lines = [f"Processing folder: {args[0]}"]
+    entry = build_folder(*args, log=lines.append)
+    return entry, lines
+
+def generate_preloaded_reports(input_dir='./preloaded_reports', output_dir='./public/preloaded', lazy=False,
+                               chunk_size=0, manifest_path=None, force=False, search=False,
+                               render_md=False, jobs=None, blobs=False):
+    """Generate JSON files from preloaded report folders.
+
+    With lazy=True each file body is written to <output_dir>/<folder>/<file>
+    instead of being bundled into <folder>.json. With chunk_size > 0, files
+    larger than chunk_size bytes are written as chunks (see write_chunked)
+    and left out of the bundle.
+
+    Source hashes are kept in a manifest (default <input_dir>/.manifest.json);
+    folders whose sources and options are unchanged are not rebuilt, and
+    index.json is only rewritten when its contents change.
+
+    With search=True the inverted index in <output_dir>/search/ is rebuilt
+    whenever any source file changed (see build_search_index). With
+    render_md=True each .md file is also pre-rendered to HTML.
+
+    Folders that need rebuilding are spread over a pool of `jobs` worker
+    processes (default: CPU count); jobs=1 builds them in this process.
+
+    With blobs=True file bodies are deduplicated into <output_dir>/blobs/
+    and blobs no longer referenced by any folder are removed.
+    """
 
     # Get list of folders in preloaded_reports
     if not os.path.exists(input_dir):
         print(f"Error: Input directory '{input_dir}' does not exist.")
         return
 
-    folders = []
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    if manifest_path is None:
+        manifest_path = os.path.join(input_dir, '.manifest.json')
+    options = {'lazy': lazy, 'chunkSize': chunk_size, 'renderMarkdown': render_md, 'blobs': blobs,
+               'output': os.path.abspath(output_dir)}
+    render_cache = os.path.join(input_dir, '.render_cache') if render_md else None
+    manifest = {} if force else load_manifest(manifest_path)
+    previous = manifest.get('folders', {}) if manifest.get('options') == options else {}
+    new_manifest = {'options': options, 'folders': {}}
+
+    entries = {}
+    pending = []
     folder_entries = os.listdir(input_dir)
 
     for folder_name in sorted(folder_entries):
@@ -48,44 +656,77 @@ def generate_preloaded_reports(input_dir='./preloaded_reports', output_dir='./pu
         if not os.path.isdir(folder_path) or folder_name.startswith('.'):
             continue
 
-        print(f"Processing folder: {folder_name}")
-
         # Get all .txt and .md files in the folder
-        files_data = {}
-        file_list = os.listdir(folder_path)
-        text_files = [f for f in file_list if f.endswith('.txt') or f.endswith('.md')]
-        text_files.sort(key=lambda x: x.lower())
-
-        file_count = 0
-        for filename in text_files:
-            file_path = os.path.join(folder_path, filename)
-            content = process_file(file_path)
+        text_files = list_text_files(folder_path)
+        prev = previous.get(folder_name, {})
+        sources = source_state(folder_path, text_files, prev.get('sources', {}))
+        if blobs:
+            prev_files = (prev.get('entry') or {}).get('files', [])
+            output_exists = all(os.path.exists(os.path.join(output_dir, m['blob']))
+                                for m in prev_files if 'blob' in m)
+        else:
+            output_exists = os.path.exists(os.path.join(output_dir, folder_name if lazy else f"{folder_name}.json"))
 
-            if content is not None:
-                files_data[filename] = content
-                file_count += 1
-                print(f"  - {filename} ({len(content):,} chars)")
-
-        if file_count > 0:
-            # Save folder contents to JSON
-            folder_json_path = os.path.join(output_dir, f"{folder_name}.json")
-            with open(folder_json_path, 'w', encoding='utf-8') as f:
-                json.dump(files_data, f, ensure_ascii=False, indent=2)
-            print(f"  Saved to {folder_json_path}")
-
-            folders.append({
-                'name': folder_name,
-                'fileCount': file_count
-            })
+        if prev and output_exists and {k: v['hash'] for k, v in sources.items()} == \
+                {k: v['hash'] for k, v in prev['sources'].items()}:
+            print(f"Unchanged folder: {folder_name}")
+            entries[folder_name] = prev['entry']
         else:
-            print(f"  No .txt or .md files found, skipping.")
+            entries[folder_name] = None
+            pending.append((folder_name, folder_path, text_files, output_dir, lazy, chunk_size, render_cache,
+                            blobs))
+        new_manifest['folders'][folder_name] = {'sources': sources}
+
+    rebuilt = len(pending)
+    jobs = min(jobs or os.cpu_count() or 1, rebuilt)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for job, (entry, lines) in zip(pending, pool.map(_build_folder_job, pending)):
+                print('\n'.join(lines))
+                entries[job[0]] = entry
+    else:
+        for job in pending:
+            print(f"Processing folder: {job[0]}")
+            entries[job[0]] = build_folder(*job)
+
+    folders = []
+    for folder_name, entry in entries.items():
+        new_manifest['folders'][folder_name]['entry'] = entry
+        if entry is not None:
+            folders.append(entry)
+
+    if blobs:
+        referenced = {m['blob'][len('blobs/'):] for entry in folders for m in entry['files'] if 'blob' in m}
+        blob_dir = os.path.join(output_dir, 'blobs')
+        stale = [name for name in os.listdir(blob_dir) if name not in referenced] if os.path.isdir(blob_dir) else []
+        for name in stale:
+            os.remove(os.path.join(blob_dir, name))
+        file_total = sum(1 for entry in folders for m in entry['files'] if 'blob' in m)
+        print(f"🧱 {file_total} file(s) stored as {len(referenced)} unique blob(s)"
+              + (f", removed {len(stale)} stale" if stale else ""))
 
     # Save index of all folders
     index_path = os.path.join(output_dir, 'index.json')
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump({'folders': folders}, f, ensure_ascii=False, indent=2)
+    index_data = json.dumps({'folders': folders}, ensure_ascii=False, indent=2).encode('utf-8')
+    index_changed = write_if_changed(index_path, index_data)
+    if search:
+        source_hashes = {name: {k: v['hash'] for k, v in f['sources'].items()}
+                         for name, f in new_manifest['folders'].items()}
+        search_key = hashlib.sha256(json.dumps([STEMMER_VERSION, source_hashes], sort_keys=True)
+                                    .encode('utf-8')).hexdigest()
+        if manifest.get('search') == search_key and \
+                os.path.exists(os.path.join(output_dir, 'search', 'index.json')):
+            print("Search index unchanged")
+        else:
+            term_count, shard_count = build_search_index(input_dir, folders, output_dir)
+            print(f"🔎 Indexed {term_count:,} terms into {shard_count} search shard(s)")
+        new_manifest['search'] = search_key
+    write_if_changed(manifest_path, json.dumps(new_manifest, ensure_ascii=False, indent=2).encode('utf-8'))
 
-    print(f"\n✅ Generated index.json with {len(folders)} folder(s)")
+    if rebuilt or index_changed:
+        print(f"\n✅ Generated index.json with {len(folders)} folder(s) ({rebuilt} rebuilt)")
+    else:
+        print(f"\n✅ Nothing changed ({len(folders)} folder(s) up to date)")
     print(f"📁 Output directory: {output_dir}")
 
     return folders
@@ -96,10 +737,28 @@ def main():
                         help='Input directory containing report folders (default: ./preloaded_reports)')
     parser.add_argument('-o', '--output', default='./public/preloaded',
                         help='Output directory for JSON files (default: ./public/preloaded)')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Write each file body separately instead of one <folder>.json')
+    parser.add_argument('--chunk-size', type=int, default=0, metavar='BYTES',
+                        help='Split files larger than BYTES into chunks (default: 0, off)')
+    parser.add_argument('--manifest', default=None,
+                        help='Source hash manifest (default: <input>/.manifest.json)')
+    parser.add_argument('--force', action='store_true',
+                        help='Ignore the manifest and rebuild every folder')
+    parser.add_argument('--search', action='store_true',
+                        help='Also build the sharded inverted search index in <output>/search/')
+    parser.add_argument('--render-md', action='store_true',
+                        help='Pre-render .md reports to HTML with a table of contents')
+    parser.add_argument('--blobs', action='store_true',
+                        help='Store each unique file body once in <output>/blobs/<sha256>')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes for rebuilding folders (default: CPU count)')
 
     args = parser.parse_args()
 
-    generate_preloaded_reports(args.input, args.output)
+    generate_preloaded_reports(args.input, args.output, lazy=args.lazy, chunk_size=args.chunk_size,
+                               manifest_path=args.manifest, force=args.force, search=args.search,
+                               render_md=args.render_md, jobs=args.jobs, blobs=args.blobs)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Align the speeches of two versions of a play (e.g. original and modern).
+Usage: python align_plays.py romeo_and_juliet_.json romeo_and_juliet_modern.json [out.json]
+       (default output: <original>.align.json, e.g. romeo_and_juliet_.align.json)
+
+Scenes are paired by act and scene number. Within a scene, the two line
+lists are aligned by global sequence alignment (Needleman-Wunsch scoring,
+Hirschberg's divide and conquer), so space stays linear in the scene length.
+Lines pair up well when they have the same speaker (or are both stage
+directions) and similar word counts. A speech present in only one version
+becomes a gap instead of shifting every later line.
+
+Output (no whitespace):
+  {"align": 1, "original": "...", "modern": "...",
+   "scenes": [{"act": 1, "scene": 1, "pairs": [[0, 0], [1, null], [null, 1], ...]}]}
+Each pair is [original line index, modern line index]; null marks a gap.
+indexRegular.html uses the map for the interleaved view when ALIGNMENT_URL
+is set, instead of pairing lines index by index. With a map, line counts no
+longer have to match, so replace_lines.py rebalancing is not needed.
+"""
+
+import sys
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ALIGN_VERSION = 1
+DIRECTION = 'STAGE_DIRECTION'
+
+GAP = -1.0
+SAME_SPEAKER = 3.0
+BOTH_DIRECTIONS = 2.0
+OTHER_SPEAKER = -1.5
+SPEECH_VS_DIRECTION = -3.0
+
+Item = Tuple[str, int]          # (normalised speaker, word count)
+Pair = Tuple[Optional[int], Optional[int]]
+
+
+def line_items(lines: List[Dict[str, Any]]) -> List[Item]:
+    return [(' '.join(str(l.get('speaker', '')).upper().split()), len(str(l.get('text', '')).split()))
+            for l in lines]
+
+
+def score(a: Item, b: Item) -> float:
+    """Similarity of two lines; word-count ratio adds up to 2 points (1 for a speaker mismatch)."""
+    a_dir = a[0] == DIRECTION
+    b_dir = b[0] == DIRECTION
+    if a_dir != b_dir:
+        return SPEECH_VS_DIRECTION
+    ratio = min(a[1], b[1]) / max(a[1], b[1], 1)
+    if a_dir:
+        return BOTH_DIRECTIONS + ratio
+    if a[0] == b[0]:
+        return SAME_SPEAKER + 2 * ratio
+    return OTHER_SPEAKER + ratio
+
+
+def _last_row(a: List[Item], b: List[Item]) -> List[float]:
+    """Needleman-Wunsch scores of a against every prefix of b, in O(len(b)) space."""
+    prev = [j * GAP for j in range(len(b) + 1)]
+    for x in a:
+        cur = [prev[0] + GAP]
+        for j, y in enumerate(b, 1):
+            cur.append(max(prev[j - 1] + score(x, y), prev[j] + GAP, cur[j - 1] + GAP))
+        prev = cur
+    return prev
+
+
+def _align_small(a: List[Item], b: List[Item]) -> List[Pair]:
+    """Full-matrix alignment with traceback, used once a side has at most one item."""
+    n, m = len(a), len(b)
+    dp = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        dp[i][0] = i * GAP
+    for j in range(1, m + 1):
+        dp[0][j] = j * GAP
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            dp[i][j] = max(dp[i - 1][j - 1] + score(a[i - 1], b[j - 1]),
+                           dp[i - 1][j] + GAP, dp[i][j - 1] + GAP)
+    pairs = []
+    i, j = n, m
+    while i or j:
+        if i and j and dp[i][j] == dp[i - 1][j - 1] + score(a[i - 1], b[j - 1]):
+            pairs.append((i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif i and dp[i][j] == dp[i - 1][j] + GAP:
+            pairs.append((i - 1, None))
+            i -= 1
+        else:
+            pairs.append((None, j - 1))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+
+def align(a: List[Item], b: List[Item], a_off: int = 0, b_off: int = 0) -> List[Pair]:
+    """Hirschberg alignment of a and b; indices in the result are offset by a_off/b_off."""
+    if len(a) <= 1 or len(b) <= 1:
+        return [(None if i is None else i + a_off, None if j is None else j + b_off)
+                for i, j in _align_small(a, b)]
+    mid = len(a) // 2
+    left = _last_row(a[:mid], b)
+    right = _last_row(a[mid:][::-1], b[::-1])
+    m = len(b)
+    split = max(range(m + 1), key=lambda j: left[j] + right[m - j])
+    return (align(a[:mid], b[:split], a_off, b_off)
+            + align(a[mid:], b[split:], a_off + mid, b_off + split))
+
+
+def align_plays(original: Dict[str, Any], modern: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Alignment entries for every scene present in both versions."""
+    modern_scenes = {
+        (act.get('act_number'), scene.get('scene_number')): scene
+        for act in modern.get('acts', [])
+        for scene in act.get('scenes', [])
+    }
+    scenes = []
+    for act in original.get('acts', []):
+        for scene in act.get('scenes', []):
+            key = (act.get('act_number'), scene.get('scene_number'))
+            other = modern_scenes.get(key)
+            if other is None:
+                continue
+            pairs = align(line_items(scene.get('lines', [])), line_items(other.get('lines', [])))
+            scenes.append({'act': key[0], 'scene': key[1], 'pairs': [list(p) for p in pairs]})
+    return scenes
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python align_plays.py original.json modern.json [out.json]")
+        sys.exit(1)
+
+    original_file, modern_file = sys.argv[1], sys.argv[2]
+    output_file = sys.argv[3] if len(sys.argv) > 3 else str(Path(original_file).with_suffix('')) + '.align.json'
+    try:
+        with open(original_file, 'r', encoding='utf-8') as f:
+            original = json.load(f)
+        with open(modern_file, 'r', encoding='utf-8') as f:
+            modern = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    scenes = align_plays(original, modern)
+    alignment = {
+        'align': ALIGN_VERSION,
+        'original': Path(original_file).name,
+        'modern': Path(modern_file).name,
+        'scenes': scenes,
+    }
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(alignment, f, separators=(',', ':'))
+
+    pairs = sum(len(s['pairs']) for s in scenes)
+    gaps = sum(1 for s in scenes for i, j in s['pairs'] if i is None or j is None)
+    drifted = sum(1 for s in scenes if any(i != j for i, j in s['pairs']))
+    print(f"Aligned {len(scenes)} scenes: {pairs} pairs, {gaps} gaps, "
+          f"{drifted} scenes differ from index-by-index pairing")
+    print(f"Output saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
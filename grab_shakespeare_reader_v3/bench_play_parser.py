@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Benchmark play_parser against the two original parsers.
+Usage: python bench_play_parser.py [--repeat=5]
+
+Every *.txt play in this folder is parsed by play_parser (layout
+auto-detected) and by the original text_to_json.py / text_to_json_v2.py
+state machines, which are kept verbatim below as references. The acts of
+each layout are checked against the reference parser for that layout.
+"""
+
+import sys
+import re
+import glob
+import time
+from typing import List, Dict, Any
+
+from play_parser import parse_play, detect_layout, roman_to_int, to_roman
+
+
+def reference_parse_romeo_juliet(filename: str) -> Dict[str, Any]:
+    """
+    Original text_to_json.py parser, kept verbatim for parity checks.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    play_data = {
+        "title": "Romeo and Juliet",
+        "author": "William Shakespeare",
+        "acts": []
+    }
+
+    current_act = None
+    current_scene = None
+    current_speaker = None
+    line_buffer = []
+
+    # Track if we've started the actual play content
+    play_started = False
+    in_scene_header = False
+    entered_actual_content = False
+
+    for line_num, line in enumerate(lines):
+        stripped = line.strip()
+        upper = stripped.upper()
+
+        # Look for stage directions like "Enter" which mark actual play content
+        # Handle both regular and italic formats (_Enter_)
+        if not entered_actual_content:
+            if re.search(r'(^|_)\s*Enter\s+', stripped, re.IGNORECASE):
+                entered_actual_content = True
+
+        # Skip until we find the first ACT after we've entered actual content
+        if not play_started:
+            if entered_actual_content and re.match(r'^ACT\s+[IVX]+\.?\s*$', upper):
+                play_started = True
+            else:
+                continue
+
+        # Check for ACT marker (with or without period)
+        act_match = re.match(r'^ACT\s+([IVX]+)\.?\s*$', upper)
+        if act_match:
+            # Save previous scene if exists
+            if current_scene and line_buffer:
+                current_scene['lines'].append({
+                    'speaker': current_speaker,
+                    'text': '\n'.join(line_buffer)
+                })
+                line_buffer = []
+
+            # Create new act
+            act_num = roman_to_int(act_match.group(1))
+            current_act = {
+                "act_number": act_num,
+                "act_title": stripped,
+                "scenes": []
+            }
+            play_data["acts"].append(current_act)
+            current_scene = None
+            current_speaker = None
+            in_scene_header = True
+            continue
+
+        # Check for SCENE marker
+        scene_match = re.match(r'^SCENE\s+([IVX]+)\.?\s*(.*)', upper)
+        if scene_match and current_act:
+            in_scene_header = True
+            # Save previous scene's last dialogue
+            if current_scene and line_buffer:
+                current_scene['lines'].append({
+                    'speaker': current_speaker,
+                    'text': '\n'.join(line_buffer)
+                })
+                line_buffer = []
+
+            # Create new scene
+            scene_num = roman_to_int(scene_match.group(1))
+            scene_location = scene_match.group(2).strip() if scene_match.group(2) else ""
+
+            # Look ahead for location on next line if not on same line
+            if not scene_location and line_num + 1 < len(lines):
+                next_line = lines[line_num + 1].strip()
+                if next_line and not re.match(r'^(ACT|SCENE|[A-Z\s]+\.)', next_line.upper()):
+                    scene_location = next_line
+
+            current_scene = {
+                "scene_number": scene_num,
+                "scene_title": stripped,
+                "location": scene_location,
+                "lines": []
+            }
+            current_act["scenes"].append(current_scene)
+            current_speaker = None
+            continue
+
+        # Skip "Act X Scene Y" repetition lines
+        if re.match(r'^Act\s+\d+\s+Scene\s+\d+\s*$', stripped):
+            in_scene_header = False
+            continue
+
+        # Check if this is a stage direction starting with "Enter", "Exit", etc.
+        # Handle both regular and italic formats (_Enter_, [_Exit._])
+        if current_scene and re.search(r'(^|_|\s)(Enter|Exit|Exeunt|Re-enter)\s+', stripped, re.IGNORECASE):
+            # Save previous speaker's lines
+            if current_speaker and line_buffer:
+                current_scene['lines'].append({
+                    'speaker': current_speaker,
+                    'text': '\n'.join(line_buffer)
+                })
+                line_buffer = []
+                current_speaker = None
+
+            current_scene['lines'].append({
+                'speaker': 'STAGE_DIRECTION',
+                'text': stripped
+            })
+            in_scene_header = False
+            continue
+
+        # Check for speaker (character name ending with a period)
+        # Handle both regular format "ROMEO." and italic format "_Rom._"
+        speaker_match = re.match(r'^_?([A-Z][A-Za-z\s\'\-]+)\._?\s*$', stripped)
+        if speaker_match and current_scene and not in_scene_header:
+            # Save previous speaker's lines
+            if current_speaker and line_buffer:
+                current_scene['lines'].append({
+                    'speaker': current_speaker,
+                    'text': '\n'.join(line_buffer)
+                })
+                line_buffer = []
+
+            # New speaker - clean up any underscores
+            current_speaker = speaker_match.group(1).strip().upper()
+            continue
+
+        # Regular line of dialogue or stage direction
+        if stripped and current_scene and not in_scene_header:
+            # Stage directions (in brackets or parentheses)
+            if stripped.startswith('[') or stripped.startswith('('):
+                if current_speaker and line_buffer:
+                    current_scene['lines'].append({
+                        'speaker': current_speaker,
+                        'text': '\n'.join(line_buffer)
+                    })
+                    line_buffer = []
+
+                current_scene['lines'].append({
+                    'speaker': 'STAGE_DIRECTION',
+                    'text': stripped
+                })
+                current_speaker = None
+            else:
+                # Regular dialogue line
+                if current_speaker:
+                    line_buffer.append(stripped)
+                elif not re.match(r'^(DRAMATIS|CHARACTERS|SCENE\.)', upper):
+                    # Could be narrative text or something else
+                    # Only add if we're past the headers
+                    pass
+
+    # Save final buffered lines
+    if current_scene and current_speaker and line_buffer:
+        current_scene['lines'].append({
+            'speaker': current_speaker,
+            'text': '\n'.join(line_buffer)
+        })
+
+    return play_data
+
+
+
+def reference_parse_shakespeare_play(filename: str) -> Dict[str, Any]:
+    """
+    Original text_to_json_v2.py parser, kept verbatim for parity checks.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    # Extract title from first lines
+    title = "Unknown Play"
+    author = "William Shakespeare"
+    for line in lines[:50]:
+        stripped = line.strip().upper()
+        if 'TEMPEST' in stripped and not stripped.startswith('SCENE'):
+            title = "The Tempest"
+            break
+        elif 'ROMEO' in stripped and 'JULIET' in stripped:
+            title = "Romeo and Juliet"
+            break
+
+    play_data = {
+        "title": title,
+        "author": author,
+        "acts": []
+    }
+
+    current_act = None
+    current_scene = None
+    current_speaker = None
+    line_buffer = []
+    play_started = False
+
+    for line_num, line in enumerate(lines):
+        stripped = line.strip()
+
+        # Check for "Act X Scene Y" marker
+        act_scene_match = re.match(r'^Act\s+(\d+)\s+Scene\s+(\d+)\s*$', stripped, re.IGNORECASE)
+        if act_scene_match:
+            play_started = True
+            act_num = int(act_scene_match.group(1))
+            scene_num = int(act_scene_match.group(2))
+
+            # Save previous speaker's lines
+            if current_scene and current_speaker and line_buffer:
+                current_scene['lines'].append({
+                    'speaker': current_speaker,
+                    'text': '\n'.join(line_buffer)
+                })
+                line_buffer = []
+                current_speaker = None
+
+            # Check if we need to create a new act
+            if current_act is None or current_act['act_number'] != act_num:
+                current_act = {
+                    "act_number": act_num,
+                    "act_title": f"ACT {to_roman(act_num)}",
+                    "scenes": []
+                }
+                play_data["acts"].append(current_act)
+
+            # Look ahead for scene location (usually on previous or next lines)
+            scene_location = ""
+            if line_num > 0:
+                prev_line = lines[line_num - 1].strip()
+                if prev_line and not re.match(r'^Act\s+\d+', prev_line):
+                    scene_location = prev_line
+
+            if not scene_location and line_num + 1 < len(lines):
+                next_line = lines[line_num + 1].strip()
+                if next_line and not re.match(r'^(Enter|Exit)', next_line, re.IGNORECASE):
+                    scene_location = next_line
+
+            current_scene = {
+                "scene_number": scene_num,
+                "scene_title": f"Scene {to_roman(scene_num)}. {scene_location}" if scene_location else f"Scene {to_roman(scene_num)}",
+                "location": scene_location.upper() if scene_location else "",
+                "lines": []
+            }
+            current_act["scenes"].append(current_scene)
+            continue
+
+        if not play_started:
+            continue
+
+        # Check for stage directions (Enter, Exit, Exeunt, etc.)
+        if re.match(r'^(Enter|Exit|Exeunt|Re-enter|Aside|Within)(\s+|$)', stripped, re.IGNORECASE):
+            # Save previous speaker's lines
+            if current_speaker and line_buffer:
+                current_scene['lines'].append({
+                    'speaker': current_speaker,
+                    'text': '\n'.join(line_buffer)
+                })
+                line_buffer = []
+                current_speaker = None
+
+            current_scene['lines'].append({
+                'speaker': 'STAGE_DIRECTION',
+                'text': stripped
+            })
+            continue
+
+        # Check if this line is a speaker name
+        # Speaker names are: all caps, on their own line, short, not stage directions
+        if stripped and stripped.isupper() and len(stripped) < 30:
+            # Make sure it's not a stage direction
+            if not re.match(r'^(Enter|Exit|Exeunt|Re-enter|Aside|Within|Alarum|Flourish)\s*', stripped, re.IGNORECASE):
+                # Save previous speaker's lines
+                if current_speaker and line_buffer:
+                    current_scene['lines'].append({
+                        'speaker': current_speaker,
+                        'text': '\n'.join(line_buffer)
+                    })
+                    line_buffer = []
+
+                current_speaker = stripped
+                continue
+
+        # Regular dialogue line
+        if stripped and current_speaker:
+            line_buffer.append(stripped)
+
+    # Save final buffered lines
+    if current_scene and current_speaker and line_buffer:
+        current_scene['lines'].append({
+            'speaker': current_speaker,
+            'text': '\n'.join(line_buffer)
+        })
+
+    return play_data
+
+
+REFERENCES = {
+    'gutenberg': reference_parse_romeo_juliet,
+    'act_scene': reference_parse_shakespeare_play,
+}
+
+
+def timed(fn, files: List[str], repeat: int) -> float:
+    """Best-of-repeat seconds to run fn over every file."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for f in files:
+            fn(f)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    repeat = 5
+    for arg in sys.argv[1:]:
+        if arg.startswith("--repeat="):
+            repeat = int(arg.split("=")[1])
+
+    files = []
+    failures = 0
+    for f in sorted(glob.glob('*.txt')):
+        with open(f, 'r', encoding='utf-8') as fh:
+            lines = fh.readlines()
+        try:
+            layout = detect_layout(lines)
+        except ValueError:
+            print(f"  skip {f}: not a play")
+            continue
+        files.append(f)
+        ok = parse_play(f)['acts'] == REFERENCES[layout](f)['acts']
+        failures += not ok
+        print(f"  {f}: {layout}, parity {'ok' if ok else 'MISMATCH'}")
+
+    print(f"\nParsing {len(files)} plays, best of {repeat}:")
+    t_v1 = timed(reference_parse_romeo_juliet, files, repeat)
+    t_v2 = timed(reference_parse_shakespeare_play, files, repeat)
+    t_new = timed(parse_play, files, repeat)
+    print(f"  text_to_json.py:    {t_v1 * 1000:7.1f} ms")
+    print(f"  text_to_json_v2.py: {t_v2 * 1000:7.1f} ms")
+    print(f"  play_parser.py:     {t_new * 1000:7.1f} ms  "
+          f"({t_v1 / t_new:.2f}x / {t_v2 / t_new:.2f}x faster)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
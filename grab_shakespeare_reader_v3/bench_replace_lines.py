@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark the heap-based line balancing in replace_lines against the original.
+Usage: python bench_replace_lines.py [--max=8000] [--checks=500]
+
+The original quadratic smart_merge_lines and the merge loop that ended
+smart_split_lines are kept verbatim below as references. Random inputs
+(including many equal lengths, to exercise tie-breaking) are checked for
+identical results, then both versions are timed on growing pastes merged
+into a 20-line range.
+"""
+
+import sys
+import random
+import time
+
+from replace_lines import smart_merge_lines, merge_adjacent
+
+
+def reference_smart_merge_lines(lines, target_count):
+    """
+    Original replace_lines.smart_merge_lines, kept verbatim for parity checks.
+    """
+    while len(lines) > target_count:
+        # Find the two shortest adjacent lines to merge
+        min_idx = 0
+        min_len = len(lines[0].strip()) + len(lines[1].strip())
+
+        for i in range(len(lines) - 1):
+            combined_len = len(lines[i].strip()) + len(lines[i+1].strip())
+            if combined_len < min_len:
+                min_len = combined_len
+                min_idx = i
+
+        # Merge the two lines
+        merged = lines[min_idx].strip() + ' ' + lines[min_idx + 1].strip() + '\n'
+        lines[min_idx] = merged
+        lines.pop(min_idx + 1)
+
+    return lines
+
+
+def reference_merge_parts(parts, target_count):
+    """
+    Original merge loop at the end of smart_split_lines, kept verbatim.
+    """
+    while len(parts) > target_count:
+        # Find the two shortest adjacent parts to merge
+        min_idx = 0
+        min_len = len(parts[0]) + len(parts[1])
+        for i in range(len(parts) - 1):
+            combined_len = len(parts[i]) + len(parts[i+1])
+            if combined_len < min_len:
+                min_len = combined_len
+                min_idx = i
+
+        # Merge the two parts
+        parts[min_idx] = parts[min_idx] + ' ' + parts[min_idx + 1]
+        parts.pop(min_idx + 1)
+
+    return parts
+
+
+WORDS = "thou art a villain hence banished love night what light through yonder window breaks".split()
+
+
+def random_lines(rng, n, max_words=12):
+    lines = []
+    for _ in range(n):
+        words = rng.randint(0, max_words)
+        line = ' '.join(rng.choice(WORDS) for _ in range(words))
+        # Occasional blank or padded lines, as pasted text has
+        lines.append(rng.choice(['', ' ', '  ']) + line + rng.choice(['\n', ' \n']))
+    return lines
+
+
+def check_parity(checks):
+    rng = random.Random(1)
+    failures = 0
+    for _ in range(checks):
+        n = rng.randint(1, 60)
+        target = rng.randint(1, n)
+        lines = random_lines(rng, n, rng.choice([1, 3, 12]))
+        if smart_merge_lines(lines[:], target) != reference_smart_merge_lines(lines[:], target):
+            failures += 1
+        parts = [line.strip() for line in lines]
+        if merge_adjacent(parts, target, len, lambda a, b: a + ' ' + b) != reference_merge_parts(parts[:], target):
+            failures += 1
+    return failures
+
+
+def timed(fn, lines, target):
+    start = time.perf_counter()
+    fn(lines[:], target)
+    return time.perf_counter() - start
+
+
+def main():
+    max_lines = 8000
+    checks = 500
+    for arg in sys.argv[1:]:
+        if arg.startswith("--max="):
+            max_lines = int(arg.split("=")[1])
+        elif arg.startswith("--checks="):
+            checks = int(arg.split("=")[1])
+
+    failures = check_parity(checks)
+    print(f"Parity on {checks} random inputs (both merges): {'ok' if not failures else f'{failures} MISMATCH'}")
+
+    print(f"\nMerging n pasted lines into a 20-line range:")
+    print(f"  {'n':>6}  {'original':>10}  {'heap':>10}  speedup")
+    rng = random.Random(2)
+    n = 250
+    while n <= max_lines:
+        lines = random_lines(rng, n)
+        t_old = timed(reference_smart_merge_lines, lines, 20)
+        t_new = timed(smart_merge_lines, lines, 20)
+        print(f"  {n:6d}  {t_old * 1000:8.1f}ms  {t_new * 1000:8.1f}ms  {t_old / t_new:6.1f}x")
+        n *= 2
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,8 @@ Bulk replace lines in a file with clipboard content (no auto-balancing).
 
 Usage:
     python bulk_replace_lines.py <start_line> <end_line> [filename]
+    python bulk_replace_lines.py --patch=changes.patch [filename] [--dry-run]
+    python bulk_replace_lines.py undo|redo|log [filename]
 
 Examples:
     python bulk_replace_lines.py 1780 1870
@@ -12,15 +14,21 @@ Examples:
 The script will:
 1. Read content from your clipboard
 2. Replace lines exactly as-is (NO auto-balancing)
-3. Create a backup of the original file (.bak)
+3. Journal the change in <file>.journal so it can be undone (see edit_journal.py)
 4. Show summary and ask for confirmation
+
+With --patch, every "@@ <start> <end>" hunk in the patch file (see
+line_patch.py) is applied in one pass, without prompting, and the file is
+replaced atomically. Line numbers refer to the file before the patch.
 """
 
 import sys
 import os
-import pyperclip
 from pathlib import Path
 
+from line_patch import patch_file
+from edit_journal import JOURNAL_COMMANDS, run_command, save_edit
+
 def bulk_replace_lines(filename, start_line, end_line, clipboard_content):
     """
     Replace lines start_line through end_line with clipboard content.
@@ -51,16 +59,6 @@ def bulk_replace_lines(filename, start_line, end_line, clipboard_content):
         print(f"❌ Error: End line {end_line} is out of range (file has {len(lines)} lines)")
         return False
 
-    # Create backup
-    backup_file = filename + '.bak'
-    try:
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
-        print(f"✅ Backup created: {backup_file}")
-    except Exception as e:
-        print(f"❌ Error creating backup: {e}")
-        return False
-
     # Split clipboard content into lines
     new_lines = clipboard_content.splitlines(keepends=True)
 
@@ -92,33 +90,44 @@ def bulk_replace_lines(filename, start_line, end_line, clipboard_content):
     # Replace the lines
     new_file_lines = lines[:start_idx] + new_lines + lines[end_idx:]
 
-    # Write back to file
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.writelines(new_file_lines)
-        print(f"\n✅ Successfully replaced lines {start_line}-{end_line} in '{filename}'")
-        print(f"   Original file backed up to '{backup_file}'")
-        print(f"   File now has {len(new_file_lines)} lines (was {len(lines)} lines)")
-        return True
-    except Exception as e:
-        print(f"❌ Error writing file: {e}")
-        print(f"   Your original file is safe in '{backup_file}'")
+    # Write back to file and journal the change for undo
+    hunks = [{'start': start_line, 'end': end_line, 'lines': new_lines}]
+    if not save_edit(filename, lines, hunks, new_file_lines, f"lines {start_line}-{end_line}"):
         return False
+    print(f"\n✅ Successfully replaced lines {start_line}-{end_line} in '{filename}'")
+    print(f"   File now has {len(new_file_lines)} lines (was {len(lines)} lines)")
+    print(f"   Undo with: python bulk_replace_lines.py undo {filename}")
+    return True
 
 def main():
     # Default filename
     default_filename = "romeo_and_juliet_modern.txt"
 
+    # Journal commands: undo / redo / log [filename]
+    if len(sys.argv) > 1 and sys.argv[1] in JOURNAL_COMMANDS:
+        success = run_command(sys.argv[1:], default_filename)
+        sys.exit(0 if success else 1)
+
+    # Patch mode: many hunks from a file, applied in one pass without prompting
+    patch_path = next((a.split('=', 1)[1] for a in sys.argv[1:] if a.startswith('--patch=')), None)
+    if patch_path:
+        args = [a for a in sys.argv[1:] if not a.startswith('--')]
+        filename = args[0] if args else default_filename
+        success = patch_file(filename, patch_path, dry_run='--dry-run' in sys.argv[1:])
+        sys.exit(0 if success else 1)
+
     # Parse arguments
     if len(sys.argv) < 3:
         print("Usage: python bulk_replace_lines.py <start_line> <end_line> [filename]")
+        print("       python bulk_replace_lines.py --patch=changes.patch [filename] [--dry-run]")
+        print("       python bulk_replace_lines.py undo|redo|log [filename]")
         print(f"\nDefault filename: {default_filename}")
         print("\nExamples:")
         print("  python bulk_replace_lines.py 1780 1870")
         print("  python bulk_replace_lines.py 421 444 romeo_and_juliet_modern.txt")
         print("\nFeatures:")
         print("  📋 Replaces lines exactly as-is (NO auto-balancing)")
-        print("  🔒 Creates backup before changes")
+        print("  ↩️  Journals every change for undo/redo")
         print("  ⚡ Fast - no preview, just summary")
         sys.exit(1)
 
@@ -147,6 +156,7 @@ def main():
 
     # Get clipboard content
     try:
+        import pyperclip
         clipboard_content = pyperclip.paste()
     except Exception as e:
         print(f"❌ Error accessing clipboard: {e}")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Convert every play text file in a folder to JSON in parallel.
+Usage: python convert_plays.py                      # this folder -> json/
+       python convert_plays.py plays/ -o out/ -j 4
+       python convert_plays.py -o . --force            # replace the JSON beside the sources
+       python convert_plays.py --manifest other_manifest.json
+       python convert_plays.py --shards                # + <play>/index.json and per-scene files
+
+Output goes to a json/ folder inside the input folder unless -o says
+otherwise, so the JSON files the viewer loads (some edited by hand) are
+never overwritten by accident.
+
+Titles and layouts are detected by play_parser unless a manifest says
+otherwise. plays_manifest.json in the input folder is used when no
+--manifest is given. It maps source file names to overrides, all optional:
+
+  {
+    "tempest1.txt": {"title": "The Tempest", "output": "tempest.json", "layout": "act_scene"},
+    "tempest.txt": {"skip": true}
+  }
+
+The source hash and options for each play are recorded in .convert_state.json
+in the output folder. A play is converted again only when its text, its
+manifest entry, the parser version or its output file has changed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from play_parser import PARSER_VERSION, detect_layout, stream_play
+from play_shards import SHARD_INDEX, write_play_shards
+
+STATE_NAME = '.convert_state.json'
+MANIFEST_NAME = 'plays_manifest.json'
+DEFAULT_OUTPUT = 'json'
+
+
+def load_json(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def plan_play(path: Path, out_dir: Path, entry: Dict[str, Any], shards: bool = False) -> Optional[Dict[str, Any]]:
+    """Resolve one play's job: source hash, layout, title override and output paths."""
+    data = path.read_bytes()
+    layout = entry.get('layout')
+    if not layout:
+        try:
+            layout = detect_layout(data.decode('utf-8').splitlines())
+        except (ValueError, UnicodeDecodeError):
+            return None
+    output = out_dir / entry.get('output', path.stem + '.json')
+    return {
+        'source': str(path),
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'layout': layout,
+        'title': entry.get('title'),
+        'output': str(output),
+        'shards': str(output.with_suffix('')) if shards else None,
+        'parser': PARSER_VERSION,
+    }
+
+
+def convert_job(job: Dict[str, Any]) -> Tuple[str, Dict[str, int]]:
+    """Stream one play to a temporary file, then move it into place."""
+    tmp = job['output'] + '.tmp'
+    stats = stream_play(job['source'], tmp, job['layout'], job['title'])
+    os.replace(tmp, job['output'])
+    if job['shards']:
+        # Shards need the whole play; it is read back once the stream is written.
+        with open(job['output'], 'r', encoding='utf-8') as f:
+            write_play_shards(json.load(f), job['shards'])
+    return job['source'], stats
+
+
+def outputs_exist(job: Dict[str, Any]) -> bool:
+    if not os.path.exists(job['output']):
+        return False
+    return not job['shards'] or os.path.exists(os.path.join(job['shards'], SHARD_INDEX))
+
+
+def convert_plays(input_dir: str = '.', output_dir: Optional[str] = None, manifest: Optional[str] = None,
+                  jobs: Optional[int] = None, force: bool = False, shards: bool = False) -> int:
+    """
+    Convert every *.txt play in input_dir. Returns the number converted.
+    Plays whose job matches the recorded state (and whose output still
+    exists) are skipped; the rest are spread over `jobs` worker processes
+    (default: CPU count); jobs=1 converts them in this process.
+    """
+    src_dir = Path(input_dir)
+    out_dir = Path(output_dir) if output_dir else src_dir / DEFAULT_OUTPUT
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if manifest is None and (src_dir / MANIFEST_NAME).exists():
+        manifest = str(src_dir / MANIFEST_NAME)
+    overrides = load_json(Path(manifest)) if manifest else {}
+    state_path = out_dir / STATE_NAME
+    state = {} if force else load_json(state_path).get('plays', {})
+
+    planned = []
+    for path in sorted(src_dir.glob('*.txt')):
+        entry = overrides.get(path.name, {})
+        if entry.get('skip'):
+            continue
+        job = plan_play(path, out_dir, entry, shards)
+        if job is None:
+            print(f"  skip {path.name}: no act/scene headings")
+            continue
+        planned.append((path, 'output' in entry, job))
+
+    # Two sources must not write the same file; a manifest "output" wins over a default name.
+    owners: Dict[str, str] = {}
+    for path, explicit, job in sorted(planned, key=lambda p: not p[1]):
+        owners.setdefault(job['output'], path.name)
+
+    pending: List[Dict[str, Any]] = []
+    new_state: Dict[str, Any] = {}
+    for path, _, job in planned:
+        owner = owners[job['output']]
+        if owner != path.name:
+            print(f"  skip {path.name}: {Path(job['output']).name} is written by {owner}")
+            continue
+        new_state[path.name] = job
+        if state.get(path.name) == job and outputs_exist(job):
+            print(f"  unchanged {path.name}")
+            continue
+        pending.append(job)
+
+    jobs = min(jobs or os.cpu_count() or 1, len(pending))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(convert_job, pending))
+    else:
+        results = [convert_job(job) for job in pending]
+
+    for job, (_, stats) in zip(pending, results):
+        print(f"  {Path(job['source']).name} -> {job['output']} ({job['layout']}): "
+              f"{stats['acts']} acts, {stats['scenes']} scenes, {stats['lines']} entries")
+
+    state_path.write_text(json.dumps({'plays': new_state}, indent=2), encoding='utf-8')
+    print(f"\nConverted {len(pending)} of {len(new_state)} plays"
+          + (f" using {jobs} processes" if jobs > 1 else ""))
+    return len(pending)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert a folder of plays to JSON in parallel')
+    parser.add_argument('input', nargs='?', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="Folder of play .txt files (default: this script's folder)")
+    parser.add_argument('-o', '--output', default=None,
+                        help=f'Output folder (default: {DEFAULT_OUTPUT}/ in the input folder)')
+    parser.add_argument('-m', '--manifest', default=None,
+                        help=f'JSON file of per-play title/output/layout overrides '
+                             f'(default: {MANIFEST_NAME} in the input folder, if present)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Convert every play even if unchanged')
+    parser.add_argument('--shards', action='store_true',
+                        help='Also write <play>/index.json and one JSON file per scene for lazy loading')
+    args = parser.parse_args()
+    convert_plays(args.input, args.output, args.manifest, args.jobs, args.force, args.shards)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Append-only undo journal for replace_lines.py and bulk_replace_lines.py.
+
+Every edit appends one JSON line to <file>.journal holding only the changed
+ranges, so its cost follows the size of the change rather than the file:
+
+    {"id": 7, "op": "edit", "time": "...", "desc": "lines 421-444",
+     "hunks": [{"at": 421, "old": ["..."], "new": ["..."]}], "base": "...", "sha": "..."}
+    {"id": 8, "op": "undo", "of": 7, "time": "...", "sha": "..."}
+    {"id": 9, "op": "redo", "of": 7, "time": "...", "sha": "..."}
+
+"at" is the 1-based line where "new" starts in the file after the edit.
+"base" and "sha" are short sha256s of the whole file before and after the
+edit, so undo and redo refuse to run on a file that was changed behind the
+journal's back. The undo and redo stacks are rebuilt by replaying the
+records: a new edit clears the redo stack, as in an editor.
+
+    python replace_lines.py undo [filename]
+    python replace_lines.py redo [filename]
+    python replace_lines.py log [filename]
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from line_patch import apply_hunks, write_atomic
+
+JOURNAL_SUFFIX = '.journal'
+JOURNAL_COMMANDS = ('undo', 'redo', 'log')
+
+
+def journal_path(filename: str) -> str:
+    return filename + JOURNAL_SUFFIX
+
+
+def file_sha(lines: List[str]) -> str:
+    return hashlib.sha256(''.join(lines).encode('utf-8')).hexdigest()[:16]
+
+
+def read_journal(filename: str) -> List[Dict[str, Any]]:
+    try:
+        with open(journal_path(filename), 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _last_id(filename: str) -> int:
+    """Id of the journal's last record, read from the tail only (0 if none)."""
+    try:
+        with open(journal_path(filename), 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            tail = b''
+            pos = end
+            # Grow the window backwards until it holds a whole last line
+            while pos > 0 and tail.rstrip().count(b'\n') < 1:
+                pos = max(0, pos - 4096)
+                f.seek(pos)
+                tail = f.read(end - pos)
+    except FileNotFoundError:
+        return 0
+    lines = tail.rstrip().split(b'\n')
+    return json.loads(lines[-1])['id'] if lines[-1].strip() else 0
+
+
+def _append(filename: str, record: Dict[str, Any]) -> None:
+    with open(journal_path(filename), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def _history(records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Replay the journal into (undo stack, redo stack) of edit records."""
+    undo_stack, redo_stack = [], []
+    for record in records:
+        if record['op'] == 'edit':
+            undo_stack.append(record)
+            redo_stack = []
+        elif record['op'] == 'undo' and undo_stack and undo_stack[-1]['id'] == record['of']:
+            redo_stack.append(undo_stack.pop())
+        elif record['op'] == 'redo' and redo_stack and redo_stack[-1]['id'] == record['of']:
+            undo_stack.append(redo_stack.pop())
+    return undo_stack, redo_stack
+
+
+def record_edit(filename: str, before: List[str], hunks: List[Dict[str, Any]],
+                after: List[str], desc: str) -> None:
+    """
+    Journal an applied edit. hunks are the sorted, non-overlapping
+    {'start', 'end', 'lines'} ranges (numbered in before) that turned before
+    into after.
+    """
+    entries = []
+    shift = 0
+    for hunk in hunks:
+        old = before[hunk['start'] - 1:hunk['end']]
+        entries.append({'at': hunk['start'] + shift, 'old': old, 'new': hunk['lines']})
+        shift += len(hunk['lines']) - len(old)
+    _append(filename, {
+        'id': _last_id(filename) + 1,
+        'op': 'edit',
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'desc': desc,
+        'hunks': entries,
+        'base': file_sha(before),
+        'sha': file_sha(after),
+    })
+
+
+def save_edit(filename: str, before: List[str], hunks: List[Dict[str, Any]],
+              after: List[str], desc: str) -> bool:
+    """Atomically write after to filename, then journal the edit. False if nothing was written."""
+    try:
+        write_atomic(filename, after)
+    except OSError as e:
+        print(f"❌ Error writing file: {e}")
+        print(f"   '{filename}' was not changed")
+        return False
+    try:
+        record_edit(filename, before, hunks, after, desc)
+    except OSError as e:
+        print(f"⚠️  Edit saved, but it could not be journaled ({e}); it cannot be undone")
+    return True
+
+
+def _reverse_hunks(edit: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Ranges of the edited file that restore the file before the edit."""
+    return [{'start': h['at'], 'end': h['at'] + len(h['new']) - 1, 'lines': h['old']}
+            for h in edit['hunks']]
+
+
+def _forward_hunks(edit: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Ranges of the file before the edit that redo it."""
+    hunks = []
+    shift = 0
+    for h in edit['hunks']:
+        start = h['at'] - shift
+        hunks.append({'start': start, 'end': start + len(h['old']) - 1, 'lines': h['new']})
+        shift += len(h['new']) - len(h['old'])
+    return hunks
+
+
+def _step(filename: str, op: str) -> bool:
+    records = read_journal(filename)
+    undo_stack, redo_stack = _history(records)
+    stack = undo_stack if op == 'undo' else redo_stack
+    if not stack:
+        print(f"❌ Nothing to {op} for '{filename}'")
+        return False
+    edit = stack[-1]
+
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        print(f"❌ Error: File '{filename}' not found")
+        return False
+    if file_sha(lines) != (edit['sha'] if op == 'undo' else edit['base']):
+        print(f"❌ '{filename}' does not match its state around edit #{edit['id']}; it was changed outside the journal")
+        print(f"   Refusing to {op}; see {journal_path(filename)}")
+        return False
+
+    hunks = _reverse_hunks(edit) if op == 'undo' else _forward_hunks(edit)
+    new_file_lines = apply_hunks(lines, hunks)
+    try:
+        write_atomic(filename, new_file_lines)
+        _append(filename, {
+            'id': records[-1]['id'] + 1,
+            'op': op,
+            'of': edit['id'],
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sha': file_sha(new_file_lines),
+        })
+    except OSError as e:
+        print(f"❌ Error writing file: {e}")
+        return False
+    print(f"✅ {op.capitalize()} #{edit['id']} ({edit['desc']}) in '{filename}'")
+    print(f"   File now has {len(new_file_lines)} lines (was {len(lines)} lines)")
+    return True
+
+
+def undo(filename: str) -> bool:
+    return _step(filename, 'undo')
+
+
+def redo(filename: str) -> bool:
+    return _step(filename, 'redo')
+
+
+def show_log(filename: str, limit: Optional[int] = 20) -> bool:
+    records = read_journal(filename)
+    if not records:
+        print(f"📜 No journal for '{filename}'")
+        return True
+    undo_stack, redo_stack = _history(records)
+    applied = {edit['id'] for edit in undo_stack}
+    undone = {edit['id'] for edit in redo_stack}
+    edits = [r for r in records if r['op'] == 'edit']
+    print(f"📜 {len(edits)} edit(s) journaled for '{filename}' "
+          f"({len(undo_stack)} can be undone, {len(redo_stack)} redone)")
+    for edit in edits[-limit:] if limit else edits:
+        old = sum(len(h['old']) for h in edit['hunks'])
+        new = sum(len(h['new']) for h in edit['hunks'])
+        state = "" if edit['id'] in applied else "  (undone)" if edit['id'] in undone else "  (undone, not redoable)"
+        print(f"   #{edit['id']:<4d} {edit['time']}  {edit['desc']}: {old} -> {new} lines{state}")
+    return True
+
+
+def run_command(argv: List[str], default_filename: str) -> bool:
+    """Handle `undo|redo|log [filename]`; argv excludes the script name."""
+    filename = argv[1] if len(argv) > 1 else default_filename
+    if argv[0] == 'undo':
+        return undo(filename)
+    if argv[0] == 'redo':
+        return redo(filename)
+    return show_log(filename)
@@ -3,11 +3,33 @@
 Extract Romeo and Juliet text segments starting from a specified location.
 Usage: python extract_romeo_juliet.py romeo_juliet.txt "Act 1 Scene 1"
        python extract_romeo_juliet.py romeo_juliet.txt "And too soon marr'd"
+Batch: python grabshakespeare.py hamlet.txt --batch=refs.txt --jsonl=out.jsonl
+       python grabshakespeare.py hamlet.txt --batch=- --out-dir=passages < refs.txt
 """
 
 import sys
 import re
-from typing import List, Tuple, Optional
+import io
+import os
+import json
+import hashlib
+from bisect import bisect_left
+from typing import List, Tuple, Optional, Dict, Any
+
+# Bump when the index layout or marker rules change so old sidecars are rebuilt.
+INDEX_VERSION = 2
+
+# Markers only count at the start of a line, so dialogue such as
+# "My dismal scene I needs must act alone." is not mistaken for one. The
+# keyword may be any case but the numeral must be uppercase and end the line
+# or be followed by "." ("SCENE II. A hall"), so "Act mild, sir." is dialogue.
+ACT_SCENE_RE = re.compile(r'^ACT\s+(\d+)\s+SCENE\s+(\d+)\b', re.IGNORECASE)
+ACT_RE = re.compile(r'^(?i:ACT)\s+([IVXLCDM]+|\d+)(?:\.|$)')
+SCENE_RE = re.compile(r'^(?i:SCENE)\s+([IVXLCDM]+|\d+)(?:\.|$)')
+# "BERNARDO" / "ROMEO." on their own line, or an inline "_Mast._ Boatswain!"
+SPEAKER_LINE_RE = re.compile(r"^([A-Z][A-Z '\-]*[A-Z])\.?$")
+SPEAKER_INLINE_RE = re.compile(r"^_([A-Z][A-Za-z '\-]*)\._(?:\s|$)")
+NOT_SPEAKER_RE = re.compile(r'^(ACT|SCENE|PROLOGUE|EPILOGUE|ENTER|EXIT|EXEUNT|RE-ENTER|ASIDE|WITHIN|ALARUM|FLOURISH)\b')
 
 def parse_act_scene_reference(reference: str) -> Tuple[Optional[int], Optional[int]]:
     """
@@ -26,48 +48,173 @@ def parse_act_scene_reference(reference: str) -> Tuple[Optional[int], Optional[i
     
     return None, None
 
+def read_play_bytes(filename: str) -> Tuple[List[str], str]:
+    """Read the play once; return its lines and the sha256 of the raw bytes."""
+    with open(filename, 'rb') as f:
+        data = f.read()
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').readlines()
+    return lines, hashlib.sha256(data).hexdigest()
+
 def read_play_lines(filename: str) -> List[str]:
     """Read all lines from the play file."""
     with open(filename, 'r', encoding='utf-8') as f:
         return f.readlines()
 
-def find_act_scene_line(lines: List[str], act: int, scene: Optional[int] = None) -> int:
+def numeral(s: str) -> int:
+    """Roman or Arabic numeral to int."""
+    return roman_to_int(s) if s.isalpha() else int(s)
+
+def build_play_index(lines: List[str]) -> Dict[str, Any]:
+    """
+    One pass over the play recording where each act, scene and speech starts.
+    All lists are sorted by line index:
+      acts:     [[line, act], ...]
+      scenes:   [[line, act, scene], ...]
+      speakers: [[line, name], ...]
+    plus "keys": [[act, scene, line], ...] sorted for reference lookups.
+    """
+    acts, scenes, speakers = [], [], []
+    act = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        m = ACT_SCENE_RE.match(stripped)
+        if m:
+            act = int(m.group(1))
+            acts.append([i, act])
+            scenes.append([i, act, int(m.group(2))])
+            continue
+        m = ACT_RE.match(stripped)
+        if m:
+            act = numeral(m.group(1).upper())
+            acts.append([i, act])
+            continue
+        m = SCENE_RE.match(stripped)
+        if m:
+            scenes.append([i, act, numeral(m.group(1).upper())])
+            continue
+        m = SPEAKER_INLINE_RE.match(stripped)
+        if m:
+            speakers.append([i, m.group(1).upper()])
+            continue
+        m = SPEAKER_LINE_RE.match(stripped)
+        if m and len(stripped) < 30 and not NOT_SPEAKER_RE.match(stripped):
+            speakers.append([i, m.group(1)])
+
+    # First occurrence wins, as with the old top-to-bottom scan.
+    first = {}
+    for i, a, s in scenes:
+        if a is not None:
+            first.setdefault((a, s), i)
+    keys = sorted([a, s, i] for (a, s), i in first.items())
+    return {'acts': acts, 'scenes': scenes, 'speakers': speakers, 'keys': keys}
+
+def index_path(filename: str) -> str:
+    """Sidecar cache path for a play's index."""
+    return filename + '.index.json'
+
+def load_play(filename: str, use_cache: bool = True) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Read the play and return (lines, index). The index is cached next to the
+    play and reused while the file's sha256 is unchanged.
+    """
+    lines, digest = read_play_bytes(filename)
+    sidecar = index_path(filename)
+    if use_cache:
+        try:
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == INDEX_VERSION and cached.get('sha256') == digest:
+                return lines, cached['index']
+        except (OSError, ValueError, KeyError):
+            pass
+    index = build_play_index(lines)
+    if use_cache:
+        try:
+            with open(sidecar, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'sha256': digest, 'index': index}, f,
+                          separators=(',', ':'))
+        except OSError:
+            pass
+    return lines, index
+
+def find_act_scene_line(lines: List[str], act: int, scene: Optional[int] = None,
+                        index: Optional[Dict[str, Any]] = None) -> int:
     """
     Find the line number where the specified Act/Scene begins.
     Returns the index of the line.
     """
-    for i, line in enumerate(lines):
-        line_stripped = line.strip().upper()
-        
-        if scene is not None:
-            # Look for "ACT X" (Roman or Arabic numeral)
-            act_patterns = [
-                f"ACT {act}",
-                f"ACT {int_to_roman(act)}",
-            ]
-            
-            if any(pattern in line_stripped for pattern in act_patterns):
-                # Check this line and next few lines for scene
-                for j in range(i, min(i + 10, len(lines))):
-                    check_line = lines[j].strip().upper()
-                    scene_patterns = [
-                        f"SCENE {scene}",
-                        f"SCENE {int_to_roman(scene)}",
-                    ]
-                    if any(pattern in check_line for pattern in scene_patterns):
-                        return j
-        else:
-            # Just look for Act
-            act_patterns = [
-                f"ACT {act}",
-                f"ACT {int_to_roman(act)}",
-            ]
-            if any(pattern in line_stripped for pattern in act_patterns):
+    if index is None:
+        index = build_play_index(lines)
+    if scene is not None:
+        keys = index['keys']
+        k = bisect_left(keys, [act, scene])
+        if k < len(keys) and keys[k][0] == act and keys[k][1] == scene:
+            return keys[k][2]
+    else:
+        # Acts are few; the first marker for this act is where it begins.
+        for i, a in index['acts']:
+            if a == act:
                 return i
     
     raise ValueError(f"Could not find Act {act}{f' Scene {scene}' if scene else ''}")
 
-def find_text_and_context(lines: List[str], search_text: str) -> Tuple[int, str]:
+def marker_before(entries: List[List[Any]], line: int) -> Optional[List[Any]]:
+    """Last index entry starting at or before line, by binary search."""
+    # [line + 1] sorts after every [line, ...] entry and before [line + 1, ...]
+    k = bisect_left(entries, [line + 1])
+    return entries[k - 1] if k else None
+
+def locate(index: Dict[str, Any], line: int) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    """Act, scene and speaker in effect at the given line."""
+    act = marker_before(index['acts'], line)
+    scene = marker_before(index['scenes'], line)
+    speaker = marker_before(index['speakers'], line)
+    act_num = act[1] if act else None
+    # A scene marker recorded under another act belongs to that act.
+    scene_num = scene[2] if scene and (act is None or scene[1] == act_num) else None
+    if act_num is None and scene and scene[1] is not None:
+        act_num = scene[1]
+    if speaker and scene and speaker[0] < scene[0]:
+        speaker = None
+    return act_num, scene_num, speaker[1] if speaker else None
+
+def format_context(act_num: Optional[int], scene_num: Optional[int]) -> str:
+    if act_num and scene_num:
+        return f"Act {act_num}, Scene {scene_num}"
+    elif act_num:
+        return f"Act {act_num}"
+    return "Unknown location"
+
+def build_haystack(lines: List[str]) -> Tuple[str, List[int]]:
+    """
+    Lowercase the play once for repeated searches.
+    Returns (text, starts) where starts[i] is line i's offset in text.
+    """
+    lowered = [line.lower() for line in lines]
+    starts = []
+    pos = 0
+    for line in lowered:
+        starts.append(pos)
+        pos += len(line)
+    return ''.join(lowered), starts
+
+def find_text_line(haystack: Tuple[str, List[int]], search_text_lower: str) -> int:
+    """First line containing the (lowercased) text, or -1. Matches never span lines."""
+    text, starts = haystack
+    pos = text.find(search_text_lower)
+    while pos != -1:
+        i = bisect_left(starts, pos + 1) - 1
+        end = starts[i + 1] if i + 1 < len(starts) else len(text)
+        if pos + len(search_text_lower) <= end:
+            return i
+        pos = text.find(search_text_lower, pos + 1)
+    return -1
+
+def find_text_and_context(lines: List[str], search_text: str,
+                          index: Optional[Dict[str, Any]] = None,
+                          haystack: Optional[Tuple[str, List[int]]] = None) -> Tuple[int, str]:
     """
     Find the line containing the search text and identify which Act/Scene it's in.
     Returns (line_index, context_string)
@@ -76,47 +223,21 @@ def find_text_and_context(lines: List[str], search_text: str) -> Tuple[int, str]
     
     # Find the line with the text
     found_line = -1
-    for i, line in enumerate(lines):
-        if search_text_lower in line.lower():
-            found_line = i
-            break
+    if haystack is not None:
+        found_line = find_text_line(haystack, search_text_lower)
+    else:
+        for i, line in enumerate(lines):
+            if search_text_lower in line.lower():
+                found_line = i
+                break
     
     if found_line == -1:
         raise ValueError(f"Could not find text: '{search_text}'")
     
-    # Search backwards for Act/Scene markers
-    act_num = None
-    scene_num = None
-    
-    for i in range(found_line, -1, -1):
-        line_upper = lines[i].strip().upper()
-        
-        # Look for Scene first
-        scene_match = re.search(r'SCENE\s+([IVXLCDM]+|\d+)', line_upper)
-        if scene_match and scene_num is None:
-            scene_str = scene_match.group(1)
-            # Convert Roman numerals or use digit
-            scene_num = roman_to_int(scene_str) if scene_str.isalpha() else int(scene_str)
-        
-        # Look for Act
-        act_match = re.search(r'ACT\s+([IVXLCDM]+|\d+)', line_upper)
-        if act_match and act_num is None:
-            act_str = act_match.group(1)
-            act_num = roman_to_int(act_str) if act_str.isalpha() else int(act_str)
-        
-        # If we found both, we're done
-        if act_num is not None and scene_num is not None:
-            break
-    
-    # Format the context
-    if act_num and scene_num:
-        context = f"Act {act_num}, Scene {scene_num}"
-    elif act_num:
-        context = f"Act {act_num}"
-    else:
-        context = "Unknown location"
-    
-    return found_line, context
+    if index is None:
+        index = build_play_index(lines)
+    act_num, scene_num, _ = locate(index, found_line)
+    return found_line, format_context(act_num, scene_num)
 
 def roman_to_int(s: str) -> int:
     """Convert Roman numeral to integer."""
@@ -152,28 +273,127 @@ def extract_lines(lines: List[str], start_idx: int, num_lines: int = 500) -> Lis
     end_idx = min(start_idx + num_lines, len(lines))
     return lines[start_idx:end_idx]
 
+def resolve_reference(lines: List[str], index: Dict[str, Any], reference: str,
+                      haystack: Optional[Tuple[str, List[int]]] = None) -> Tuple[int, str]:
+    """Resolve an Act/Scene reference or a text search to (line_index, location)."""
+    act, scene = parse_act_scene_reference(reference)
+    if act is not None:
+        start_idx = find_act_scene_line(lines, act, scene, index)
+        return start_idx, f"Act {act}{f', Scene {scene}' if scene else ''}"
+    return find_text_and_context(lines, reference, index, haystack)
+
+def read_references(source: str) -> List[str]:
+    """References one per line from a file, or stdin for '-'. Blank and # lines are skipped."""
+    f = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8')
+    try:
+        return [r.strip() for r in f if r.strip() and not r.lstrip().startswith('#')]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def slugify(text: str, limit: int = 40) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')[:limit] or 'ref'
+
+def run_batch(filename: str, source: str, num_lines: int, use_cache: bool,
+              out_dir: Optional[str] = None, jsonl: Optional[str] = None) -> int:
+    """
+    Load and index the play once, then resolve every reference against it.
+    Each segment is written as soon as it is resolved, either to
+    <out_dir>/NNN_<slug>.txt or as one JSON object per line to jsonl
+    ('-' for stdout). Returns the number of references that failed.
+    """
+    references = read_references(source)
+    log = sys.stderr if jsonl == '-' else sys.stdout
+    print(f"Reading {filename}...", file=log)
+    lines, index = load_play(filename, use_cache)
+    haystack = build_haystack(lines)
+    print(f"Resolving {len(references)} references against {len(lines)} lines", file=log)
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    out = None
+    if jsonl:
+        out = sys.stdout if jsonl == '-' else open(jsonl, 'w', encoding='utf-8')
+
+    failures = 0
+    try:
+        for n, reference in enumerate(references, 1):
+            try:
+                start_idx, location = resolve_reference(lines, index, reference, haystack)
+            except ValueError as e:
+                failures += 1
+                print(f"  [{n}] {e}", file=log)
+                if out:
+                    out.write(json.dumps({'reference': reference, 'error': str(e)},
+                                         ensure_ascii=False) + '\n')
+                continue
+            segment = extract_lines(lines, start_idx, num_lines)
+            text = "".join(segment)
+            if out:
+                out.write(json.dumps({
+                    'reference': reference,
+                    'line': start_idx + 1,
+                    'location': location,
+                    'speaker': locate(index, start_idx)[2],
+                    'lines': len(segment),
+                    'text': text,
+                }, ensure_ascii=False) + '\n')
+            if out_dir:
+                path = os.path.join(out_dir, f"{n:03d}_{slugify(reference)}.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+            print(f"  [{n}] {location} at line {start_idx + 1}", file=log)
+    finally:
+        if out and out is not sys.stdout:
+            out.close()
+
+    print(f"Done: {len(references) - failures} extracted, {failures} not found", file=log)
+    return failures
+
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python extract_romeo_juliet.py romeo_juliet.txt \"Act 1 Scene 1\"")
-        print("       python extract_romeo_juliet.py romeo_juliet.txt \"And too soon marr'd\"")
-        sys.exit(1)
-    
-    filename = sys.argv[1]
-    reference = sys.argv[2]
-    
+    batch = out_dir = jsonl = None
+    positional = []
     # Allow custom number of lines
     num_lines = 500
-    for arg in sys.argv[3:]:
+    use_cache = True
+    for arg in sys.argv[1:]:
         if arg.startswith("--lines="):
             try:
                 num_lines = int(arg.split("=")[1])
             except:
                 pass
+        elif arg == "--no-index-cache":
+            use_cache = False
+        elif arg.startswith("--batch="):
+            batch = arg.split("=", 1)[1]
+        elif arg.startswith("--out-dir="):
+            out_dir = arg.split("=", 1)[1]
+        elif arg.startswith("--jsonl="):
+            jsonl = arg.split("=", 1)[1]
+        else:
+            positional.append(arg)
+
+    if len(positional) < (1 if batch else 2) or (batch and not (out_dir or jsonl)):
+        print("Usage: python extract_romeo_juliet.py romeo_juliet.txt \"Act 1 Scene 1\"")
+        print("       python extract_romeo_juliet.py romeo_juliet.txt \"And too soon marr'd\"")
+        print("       python grabshakespeare.py play.txt --batch=refs.txt|- (--out-dir=DIR | --jsonl=FILE|-)")
+        sys.exit(1)
+
+    filename = positional[0]
+    if batch:
+        try:
+            failures = run_batch(filename, batch, num_lines, use_cache, out_dir, jsonl)
+        except FileNotFoundError as e:
+            print(f"Error: File '{e.filename}' not found", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(1 if failures else 0)
+
+    reference = positional[1]
     
     try:
         # Read the play
         print(f"Reading {filename}...")
-        lines = read_play_lines(filename)
+        lines, index = load_play(filename, use_cache)
         print(f"Total lines in file: {len(lines)}")
         
         # Try to parse as Act/Scene reference
@@ -181,14 +401,17 @@ def main():
         
         if act is not None:
             # It's an Act/Scene reference
-            start_idx = find_act_scene_line(lines, act, scene)
+            start_idx = find_act_scene_line(lines, act, scene, index)
             location = f"Act {act}{f', Scene {scene}' if scene else ''}"
             print(f"\nFound {location} at line {start_idx + 1}")
         else:
             # It's a text search - find the context
-            start_idx, context = find_text_and_context(lines, reference)
+            start_idx, context = find_text_and_context(lines, reference, index)
             print(f"\nFound text at line {start_idx + 1}")
             print(f"Location: {context}")
+            speaker = locate(index, start_idx)[2]
+            if speaker:
+                print(f"Speaker: {speaker}")
             location = context
         
         # Extract the segment
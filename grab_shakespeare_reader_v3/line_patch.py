@@ -0,0 +1,129 @@
+"""
+Patch files of many line-range replacements, for replace_lines.py and
+bulk_replace_lines.py --patch=FILE.
+
+Format: each hunk is a header line "@@ <start> <end>" followed by its
+replacement lines, up to the next header or the end of the file:
+
+    # comments and blank lines before the first hunk are ignored
+    @@ 421 444
+    ROMEO
+    But soft, what light is breaking through that window?
+    @@ 500 502
+    ...
+
+Line numbers are 1-based and inclusive, and always refer to the file as it
+is before the patch; hunks may be listed in any order, and each one's shift
+in line count is accounted for when the later ones are applied. A hunk with
+no lines deletes its range. A replacement line that really starts with "@@"
+is written as "\\@@".
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HUNK_HEADER_RE = re.compile(r'^@@\s+(\d+)\s+(\d+)\s*$')
+
+
+def parse_patch(text: str) -> List[Dict[str, Any]]:
+    """Hunks as {'start', 'end', 'lines', 'at'} ('at' is the header's line in the patch)."""
+    hunks = []
+    for number, line in enumerate(text.splitlines(keepends=True), 1):
+        if line.startswith('@@'):
+            match = HUNK_HEADER_RE.match(line.rstrip('\r\n'))
+            if not match:
+                raise ValueError(f"patch line {number}: expected '@@ <start> <end>', got {line.strip()!r}")
+            hunks.append({'start': int(match.group(1)), 'end': int(match.group(2)), 'lines': [], 'at': number})
+        elif hunks:
+            if line.startswith('\\@@'):
+                line = line[1:]
+            hunks[-1]['lines'].append(line if line.endswith('\n') else line + '\n')
+        elif line.strip() and not line.lstrip().startswith('#'):
+            raise ValueError(f"patch line {number}: text before the first '@@ <start> <end>' header")
+    if not hunks:
+        raise ValueError("patch has no hunks")
+    return hunks
+
+
+def validate_hunks(hunks: List[Dict[str, Any]], line_count: int) -> List[Dict[str, Any]]:
+    """Hunks sorted by start; raises ValueError for a bad range or two hunks that overlap."""
+    for hunk in hunks:
+        if not 1 <= hunk['start'] <= hunk['end']:
+            raise ValueError(f"patch line {hunk['at']}: bad range {hunk['start']}-{hunk['end']}")
+        if hunk['end'] > line_count:
+            raise ValueError(f"patch line {hunk['at']}: end line {hunk['end']} is out of range "
+                             f"(file has {line_count} lines)")
+    ordered = sorted(hunks, key=lambda h: h['start'])
+    for before, after in zip(ordered, ordered[1:]):
+        if after['start'] <= before['end']:
+            raise ValueError(f"patch lines {before['at']} and {after['at']}: ranges "
+                             f"{before['start']}-{before['end']} and {after['start']}-{after['end']} overlap")
+    return ordered
+
+
+def apply_hunks(lines: List[str], hunks: List[Dict[str, Any]]) -> List[str]:
+    """Apply validated, sorted hunks in one pass; returns the new lines."""
+    out = []
+    pos = 0
+    for hunk in hunks:
+        out.extend(lines[pos:hunk['start'] - 1])
+        out.extend(hunk['lines'])
+        pos = hunk['end']
+    out.extend(lines[pos:])
+    return out
+
+
+def write_atomic(filename: str, lines: List[str]) -> None:
+    """Write lines to a temp file beside filename, then move it into place."""
+    tmp = filename + '.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def patch_file(filename: str, patch_path: str,
+               balance: Optional[Callable[[List[str], int], Tuple[List[str], str]]] = None,
+               dry_run: bool = False) -> bool:
+    """
+    Apply every hunk of patch_path to filename without prompting. With balance
+    (replace_lines.balance_lines), each non-empty hunk is first fitted to the
+    size of its range. Nothing is written unless every hunk is valid.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        with open(patch_path, 'r', encoding='utf-8') as f:
+            hunks = validate_hunks(parse_patch(f.read()), len(lines))
+    except FileNotFoundError as e:
+        print(f"❌ Error: File '{e.filename}' not found")
+        return False
+    except ValueError as e:
+        print(f"❌ Error in {patch_path}: {e}")
+        return False
+
+    print(f"📋 Applying {len(hunks)} hunk(s) from {patch_path} to '{filename}'")
+    for hunk in hunks:
+        target_count = hunk['end'] - hunk['start'] + 1
+        action = ""
+        if balance and hunk['lines'] and len(hunk['lines']) != target_count:
+            hunk['lines'], action = balance(hunk['lines'], target_count)
+            action = f" ({action})"
+        print(f"   {hunk['start']:5d}-{hunk['end']:<5d} {target_count:4d} -> {len(hunk['lines']):4d} lines{action}")
+
+    new_file_lines = apply_hunks(lines, hunks)
+    if dry_run:
+        print(f"\n🔍 Dry run: file would have {len(new_file_lines)} lines (now {len(lines)}); nothing written")
+        return True
+
+    from edit_journal import save_edit
+    if not save_edit(filename, lines, hunks, new_file_lines, f"patch {os.path.basename(patch_path)}"):
+        return False
+    print(f"\n✅ Applied {len(hunks)} hunk(s) to '{filename}' in one pass")
+    print(f"   File now has {len(new_file_lines)} lines (was {len(lines)} lines)")
+    return True
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Convert play JSON to the compact interned format used by the reader pages.
+Usage: python play_compact.py hamlet.json [more.json ...]     # writes hamlet.min.json
+       python play_compact.py --expand hamlet.min.json        # writes hamlet.json
+
+Compact format (no whitespace):
+  {
+    "compact": 1,
+    "title": ..., "author": ...,
+    "speakers": ["HAMLET", "HORATIO", ...],     most frequent first
+    "acts": [{"n": 1, "title": "ACT I", "scenes": [
+      {"n": 1, "title": "Scene I. ...", "location": "...", "lines": [
+        [0, 3, "Who's there?"],                  speech: [LINE_SPEECH, speaker id, text]
+        [1, "Enter Ghost"]                       direction: [LINE_DIRECTION, text]
+      ]}
+    ]}]
+  }
+Any other keys on the play, acts or scenes are kept as they are, and a line
+with fields beyond speaker/text stays a plain object. expand_play()
+(expandPlay() in indexRegular.html) restores the regular schema exactly.
+"""
+
+import sys
+import json
+from collections import Counter
+from typing import Dict, Any
+
+COMPACT_VERSION = 1
+LINE_SPEECH = 0
+LINE_DIRECTION = 1
+DIRECTION_SPEAKER = 'STAGE_DIRECTION'
+
+ACT_KEYS = {'act_number': 'n', 'act_title': 'title', 'scenes': 'scenes'}
+SCENE_KEYS = {'scene_number': 'n', 'scene_title': 'title', 'location': 'location', 'lines': 'lines'}
+
+
+def _rename(obj: Dict[str, Any], keys: Dict[str, str]) -> Dict[str, Any]:
+    return {keys.get(k, k): v for k, v in obj.items()}
+
+
+def compact_play(play: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern speakers and turn each line into a short array."""
+    counts = Counter()
+    first_seen = {}
+    for act in play.get('acts', []):
+        for scene in act.get('scenes', []):
+            for line in scene.get('lines', []):
+                speaker = line.get('speaker')
+                if speaker != DIRECTION_SPEAKER and isinstance(speaker, str):
+                    counts[speaker] += 1
+                    first_seen.setdefault(speaker, len(first_seen))
+    speakers = sorted(counts, key=lambda s: (-counts[s], first_seen[s]))
+    ids = {s: i for i, s in enumerate(speakers)}
+
+    def pack(line):
+        if set(line) != {'speaker', 'text'} or not isinstance(line['text'], str):
+            return line
+        if line['speaker'] == DIRECTION_SPEAKER:
+            return [LINE_DIRECTION, line['text']]
+        if line['speaker'] in ids:
+            return [LINE_SPEECH, ids[line['speaker']], line['text']]
+        return line
+
+    acts = []
+    for act in play.get('acts', []):
+        scenes = []
+        for scene in act.get('scenes', []):
+            packed = _rename(scene, SCENE_KEYS)
+            packed['lines'] = [pack(line) for line in scene.get('lines', [])]
+            scenes.append(packed)
+        packed_act = _rename(act, ACT_KEYS)
+        packed_act['scenes'] = scenes
+        acts.append(packed_act)
+
+    out = {'compact': COMPACT_VERSION}
+    for key, value in play.items():
+        if key == 'acts':
+            out['speakers'] = speakers
+            out['acts'] = acts
+        else:
+            out[key] = value
+    if 'acts' not in out:
+        out['speakers'] = speakers
+        out['acts'] = acts
+    return out
+
+
+def expand_play(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of compact_play; regular play JSON is returned unchanged."""
+    if data.get('compact') != COMPACT_VERSION:
+        return data
+    speakers = data['speakers']
+    act_keys = {v: k for k, v in ACT_KEYS.items()}
+    scene_keys = {v: k for k, v in SCENE_KEYS.items()}
+
+    def unpack(line):
+        if not isinstance(line, list):
+            return line
+        if line[0] == LINE_DIRECTION:
+            return {'speaker': DIRECTION_SPEAKER, 'text': line[1]}
+        return {'speaker': speakers[line[1]], 'text': line[2]}
+
+    play = {}
+    for key, value in data.items():
+        if key in ('compact', 'speakers'):
+            continue
+        if key == 'acts':
+            value = [
+                dict(_rename(act, act_keys), scenes=[
+                    dict(_rename(scene, scene_keys), lines=[unpack(l) for l in scene['lines']])
+                    for scene in act['scenes']
+                ])
+                for act in value
+            ]
+        play[key] = value
+    return play
+
+
+def main():
+    expand = '--expand' in sys.argv[1:]
+    files = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not files:
+        print("Usage: python play_compact.py play.json [more.json ...]")
+        print("       python play_compact.py --expand play.min.json")
+        sys.exit(1)
+
+    for input_file in files:
+        try:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                raw = f.read()
+            data = json.loads(raw)
+        except (OSError, ValueError) as e:
+            print(f"Error: {input_file}: {e}")
+            sys.exit(1)
+
+        if expand:
+            output_file = input_file.replace('.min.json', '.json') if input_file.endswith('.min.json') \
+                else input_file.replace('.json', '.expanded.json')
+            text = json.dumps(expand_play(data), indent=2, ensure_ascii=False)
+        else:
+            output_file = input_file[:-len('.json')] + '.min.json' if input_file.endswith('.json') \
+                else input_file + '.min.json'
+            compact = compact_play(data)
+            if expand_play(compact) != data:
+                print(f"Error: {input_file}: compact form does not round-trip")
+                sys.exit(1)
+            text = json.dumps(compact, separators=(',', ':'), ensure_ascii=False)
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        before = len(raw.encode('utf-8'))
+        after = len(text.encode('utf-8'))
+        print(f"{input_file} -> {output_file}: {before:,} -> {after:,} bytes ({after / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+Convert a Shakespeare play text file to structured JSON, whatever its layout.
+Usage: python play_parser.py input.txt [output.json] ["Play Title"] [--layout=auto|gutenberg|act_scene]
+       python play_parser.py collected_works.txt out.json --stream     # constant memory
+       cat play.txt | python play_parser.py - out.json --stream --layout=act_scene
+       python play_parser.py hamlet.txt hamlet.json --shards=hamlet   # + per-scene shards
+       python play_parser.py hamlet.txt hamlet.json --indexes         # + speaker indexes
+
+Two source layouts are recognised:
+  gutenberg  - "ACT I." / "SCENE I. Place." headings, "ROMEO." or "_Rom._"
+               speaker lines (Project Gutenberg, e.g. tempest.txt)
+  act_scene  - "Act 1 Scene 1" markers with all-caps speaker names on their
+               own line (e.g. hamlet.txt, tempest1.txt)
+Both produce the same title/author/acts/scenes/lines schema that
+text_to_json.py and text_to_json_v2.py always have; those scripts now call
+parse_play() with their layout.
+
+With --indexes (indexes=True), precomputed indexes (see build_indexes) follow
+"acts" on a single line without whitespace:
+  "indexes": {"speakers": {"ROMEO": {"lines": 163, "words": 4425, "refs": [[0, 1, 5], ...]}},
+              "movements": [[0, 0, 0, "enter"], [0, 0, 40, "exeunt"], ...]}
+refs and movements are [act, scene, line] positions, all 0-based, so
+play.acts[a].scenes[s].lines[i] is the line (act and scene numbers can repeat
+in a badly formed source). Speakers are listed in order of first appearance.
+"""
+
+import sys
+import json
+import re
+from itertools import islice
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, TextIO, Tuple
+
+# Bump when parsing rules change so cached conversions are redone.
+PARSER_VERSION = 3
+
+# Layout detection: any "Act N Scene N" marker means act_scene, otherwise a
+# bare "ACT I." heading means gutenberg.
+ACT_SCENE_MARKER_RE = re.compile(r'^Act\s+(\d+)\s+Scene\s+(\d+)\s*$', re.IGNORECASE)
+ROMAN_ACT_RE = re.compile(r'^ACT\s+([IVX]+)\.?\s*$')
+
+# Title detection
+ENTIRE_PLAY_TITLE_RE = re.compile(r'^(.+?):\s*Entire Play\s*$', re.IGNORECASE)
+UNKNOWN_TITLE = "Unknown Play"
+SMALL_WORDS = {'a', 'an', 'and', 'as', 'at', 'but', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to'}
+
+# gutenberg rules
+G_ENTER_RE = re.compile(r'(^|_)\s*Enter\s+', re.IGNORECASE)
+G_SCENE_RE = re.compile(r'^SCENE\s+([IVX]+)\.?\s*(.*)')
+G_HEADER_RE = re.compile(r'^(ACT|SCENE|[A-Z\s]+\.)')
+G_ACT_SCENE_RE = re.compile(r'^Act\s+\d+\s+Scene\s+\d+\s*$')
+G_DIRECTION_RE = re.compile(r'(^|_|\s)(Enter|Exit|Exeunt|Re-enter)\s+', re.IGNORECASE)
+G_SPEAKER_RE = re.compile(r'^_?([A-Z][A-Za-z\s\'\-]+)\._?\s*$')
+
+# act_scene rules
+A_PREV_ACT_RE = re.compile(r'^Act\s+\d+')
+A_NEXT_DIRECTION_RE = re.compile(r'^(Enter|Exit)', re.IGNORECASE)
+A_DIRECTION_RE = re.compile(r'^(Enter|Exit|Exeunt|Re-enter|Aside|Within)(\s+|$)', re.IGNORECASE)
+A_NOT_SPEAKER_RE = re.compile(r'^(Enter|Exit|Exeunt|Re-enter|Aside|Within|Alarum|Flourish)\s*', re.IGNORECASE)
+
+# Entrances and exits inside stage directions
+MOVEMENT_RE = re.compile(r'\b(Re-enter|Enter|Exit|Exeunt)\b', re.IGNORECASE)
+DIRECTION_SPEAKER = 'STAGE_DIRECTION'
+
+
+def roman_to_int(s: str) -> int:
+    """Convert Roman numeral to integer."""
+    roman_values = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
+    total = 0
+    prev_value = 0
+
+    for char in reversed(s.upper()):
+        value = roman_values.get(char, 0)
+        if value < prev_value:
+            total -= value
+        else:
+            total += value
+        prev_value = value
+
+    return total
+
+
+def to_roman(num: int) -> str:
+    """Convert integer to Roman numeral."""
+    val = [10, 9, 5, 4, 1]
+    syms = ['X', 'IX', 'V', 'IV', 'I']
+    roman_num = ''
+    i = 0
+    while num > 0:
+        for _ in range(num // val[i]):
+            roman_num += syms[i]
+            num -= val[i]
+        i += 1
+    return roman_num
+
+
+def detect_layout(lines: Iterable[str]) -> str:
+    """Return 'act_scene' or 'gutenberg' for the play's heading style."""
+    gutenberg = False
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] not in 'Aa':
+            continue
+        if ACT_SCENE_MARKER_RE.match(stripped):
+            return 'act_scene'
+        if not gutenberg and ROMAN_ACT_RE.match(stripped.upper()):
+            gutenberg = True
+    if gutenberg:
+        return 'gutenberg'
+    raise ValueError("Could not detect play layout: no 'Act 1 Scene 1' or 'ACT I' headings")
+
+
+def _title_case(text: str) -> str:
+    words = text.lower().split()
+    return ' '.join(w if i and w in SMALL_WORDS else w.capitalize() for i, w in enumerate(words))
+
+
+class _TitleDetector:
+    """
+    "Hamlet: Entire Play" headers (within the first 50 lines) give the title
+    directly; otherwise use the all-caps heading just before the first act
+    (e.g. "THE TEMPEST."). Fed one stripped line at a time, in order.
+    """
+
+    __slots__ = ('count', 'entire', 'fallback', 'previous', 'seen_act')
+
+    def __init__(self):
+        self.count = 0
+        self.entire = None
+        self.fallback = None
+        self.previous = ''
+        self.seen_act = False
+
+    def feed(self, stripped: str) -> None:
+        if self.count < 50 and self.entire is None:
+            m = ENTIRE_PLAY_TITLE_RE.match(stripped)
+            if m:
+                self.entire = m.group(1).strip()
+        self.count += 1
+        if self.seen_act or not stripped:
+            return
+        if ROMAN_ACT_RE.match(stripped.upper()) or ACT_SCENE_MARKER_RE.match(stripped):
+            self.seen_act = True
+            if self.previous.isupper():
+                self.fallback = _title_case(self.previous.rstrip('.'))
+        else:
+            self.previous = stripped
+
+    @property
+    def title(self) -> str:
+        return self.entire or self.fallback or UNKNOWN_TITLE
+
+
+def detect_title(lines: Iterable[str]) -> str:
+    """Title from a "Hamlet: Entire Play" header or the heading before the first act."""
+    detector = _TitleDetector()
+    for line in lines:
+        detector.feed(line.strip())
+        if detector.seen_act and (detector.entire or detector.count >= 50):
+            break
+    return detector.title
+
+
+def _window(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str, Optional[str]]]:
+    """
+    Yield (previous, current, next) stripped lines, holding only those three.
+    previous/next are None at the start/end of the file.
+    """
+    it = iter(lines)
+    try:
+        current = next(it).strip()
+    except StopIteration:
+        return
+    previous = None
+    for line in it:
+        following = line.strip()
+        yield previous, current, following
+        previous, current = current, following
+    yield previous, current, None
+
+
+class _PlayIndexer:
+    """Speaker and entrance/exit indexes, fed one line at a time."""
+
+    __slots__ = ('speakers', 'movements')
+
+    def __init__(self):
+        self.speakers = {}
+        self.movements = []
+
+    def add(self, act: int, scene: int, index: int, speaker: str, text: str) -> None:
+        if speaker == DIRECTION_SPEAKER:
+            for match in MOVEMENT_RE.finditer(text):
+                self.movements.append([act, scene, index, match.group(1).lower()])
+            return
+        entry = self.speakers.get(speaker)
+        if entry is None:
+            entry = self.speakers[speaker] = {'lines': 0, 'words': 0, 'refs': []}
+        entry['lines'] += 1
+        entry['words'] += len(text.split())
+        entry['refs'].append([act, scene, index])
+
+    def result(self) -> Dict[str, Any]:
+        return {'speakers': self.speakers, 'movements': self.movements}
+
+
+def build_indexes(play: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Speaker -> {lines, words, refs} and the entrance/exit list for an already
+    parsed play, the same "indexes" the parser emits. Lines are counted per
+    speech, words by whitespace.
+    """
+    indexer = _PlayIndexer()
+    for a, act in enumerate(play.get('acts', [])):
+        for s, scene in enumerate(act.get('scenes', [])):
+            for i, line in enumerate(scene.get('lines', [])):
+                indexer.add(a, s, i, line.get('speaker'), line.get('text', ''))
+    return indexer.result()
+
+
+def _indexes_member(indexes: Dict[str, Any]) -> str:
+    return ',\n  "indexes": ' + json.dumps(indexes, separators=(',', ':'), ensure_ascii=False)
+
+
+def dump_play(play: Dict[str, Any], out: TextIO) -> None:
+    """
+    Write play JSON as json.dump(indent=2) does, except that "indexes", when
+    present, stays on one line: indented, its refs would add a third to the file.
+    """
+    indexes = play.get('indexes')
+    if indexes is None:
+        json.dump(play, out, indent=2, ensure_ascii=False)
+        return
+    body = json.dumps({k: v for k, v in play.items() if k != 'indexes'}, indent=2, ensure_ascii=False)
+    out.write(body[:-2] + _indexes_member(indexes) + '\n}')
+
+
+class _PlayBuilder:
+    """Shared act/scene/speech accumulation for every layout."""
+
+    __slots__ = ('play', 'act', 'scene', 'speaker', 'buffer', 'indexer', 'act_pos', 'scene_pos')
+
+    def __init__(self, title: str, indexes: bool = False):
+        self.play = {"title": title, "author": "William Shakespeare", "acts": []}
+        self.act = None
+        self.scene = None
+        self.speaker = None
+        self.buffer = []
+        self.indexer = _PlayIndexer() if indexes else None
+        # Positions are counted here because the streaming builder drops written scenes.
+        self.act_pos = -1
+        self.scene_pos = -1
+
+    def _append(self, speaker: str, text: str) -> None:
+        lines = self.scene['lines']
+        if self.indexer:
+            self.indexer.add(self.act_pos, self.scene_pos, len(lines), speaker, text)
+        lines.append({'speaker': speaker, 'text': text})
+
+    def flush(self) -> bool:
+        """Emit the buffered speech, if any. Returns True when something was emitted."""
+        if self.speaker and self.buffer:
+            self._append(self.speaker, '\n'.join(self.buffer))
+            self.buffer = []
+            return True
+        return False
+
+    def direction(self, text: str) -> None:
+        self._append(DIRECTION_SPEAKER, text)
+
+    def new_act(self, number: int, title: str) -> None:
+        self.act = {"act_number": number, "act_title": title, "scenes": []}
+        self.play["acts"].append(self.act)
+        self.scene = None
+        self.act_pos += 1
+        self.scene_pos = -1
+
+    def new_scene(self, number: int, title: str, location: str) -> None:
+        self.scene = {"scene_number": number, "scene_title": title, "location": location, "lines": []}
+        self.act["scenes"].append(self.scene)
+        self.scene_pos += 1
+
+    def finish(self) -> None:
+        if self.scene:
+            self.flush()
+        if self.indexer:
+            self.play['indexes'] = self.indexer.result()
+
+
+class _StreamingPlayBuilder(_PlayBuilder):
+    """
+    Writes each scene to out as soon as the next scene, act or end of file
+    begins, so only the current scene is ever held in memory. The output is
+    byte-identical to dump_play(play, out). With indexes, memory also grows by
+    a few integers per speech.
+    """
+
+    __slots__ = ('out', 'title_source', 'stats', 'act_open', 'scenes_in_act')
+
+    def __init__(self, out: TextIO, title_source: Callable[[], str], indexes: bool = False):
+        super().__init__('', indexes)
+        self.out = out
+        self.title_source = title_source
+        self.stats = {'acts': 0, 'scenes': 0, 'lines': 0}
+        self.act_open = False
+        self.scenes_in_act = 0
+
+    def _write_header(self) -> None:
+        title = json.dumps(self.title_source(), ensure_ascii=False)
+        self.play["title"] = self.title_source()
+        self.out.write(f'{{\n  "title": {title},\n  "author": "William Shakespeare",\n  "acts": ')
+
+    def _emit_scene(self) -> None:
+        if self.scene is None:
+            return
+        body = json.dumps(self.scene, indent=2, ensure_ascii=False).replace('\n', '\n        ')
+        self.out.write(('[\n        ' if self.scenes_in_act == 0 else ',\n        ') + body)
+        self.scenes_in_act += 1
+        self.stats['scenes'] += 1
+        self.stats['lines'] += len(self.scene['lines'])
+        self.act["scenes"].pop()
+        self.scene = None
+
+    def _close_act(self) -> None:
+        if self.act_open:
+            self.out.write('\n      ]\n    }' if self.scenes_in_act else '[]\n    }')
+
+    def new_act(self, number: int, title: str) -> None:
+        self._emit_scene()
+        if self.act is None:
+            self._write_header()
+            self.out.write('[\n    ')
+        else:
+            self._close_act()
+            self.out.write(',\n    ')
+            self.play["acts"].pop()
+        super().new_act(number, title)
+        self.out.write(f'{{\n      "act_number": {number},\n'
+                       f'      "act_title": {json.dumps(title, ensure_ascii=False)},\n'
+                       f'      "scenes": ')
+        self.act_open = True
+        self.scenes_in_act = 0
+        self.stats['acts'] += 1
+
+    def new_scene(self, number: int, title: str, location: str) -> None:
+        self._emit_scene()
+        super().new_scene(number, title, location)
+
+    def finish(self) -> None:
+        super().finish()
+        self._emit_scene()
+        if self.act is None:
+            self._write_header()
+            self.out.write('[]')
+        else:
+            self._close_act()
+            self.out.write('\n  ]')
+        if self.indexer:
+            self.out.write(_indexes_member(self.play['indexes']))
+        self.out.write('\n}')
+
+
+def _parse_gutenberg(window: Iterable[Tuple[Optional[str], str, Optional[str]]], b: _PlayBuilder) -> None:
+    """"ACT I." / "SCENE I." headings with "NAME." or "_Abbr._" speaker lines."""
+    in_scene_header = False
+    # The play starts at the first bare ACT heading after the first "Enter".
+    entered = False
+    started = False
+
+    for _, stripped, next_line in window:
+        if not started:
+            if not entered:
+                if G_ENTER_RE.search(stripped):
+                    entered = True
+                else:
+                    continue
+            if not ROMAN_ACT_RE.match(stripped.upper()):
+                continue
+            started = True
+        if not stripped:
+            continue
+        upper = stripped.upper()
+        first = upper[0]
+
+        if first == 'A':
+            act_match = ROMAN_ACT_RE.match(upper)
+            if act_match:
+                if b.scene:
+                    b.flush()
+                b.new_act(roman_to_int(act_match.group(1)), stripped)
+                b.speaker = None
+                in_scene_header = True
+                continue
+
+        if first == 'S' and b.act:
+            scene_match = G_SCENE_RE.match(upper)
+            if scene_match:
+                in_scene_header = True
+                if b.scene:
+                    b.flush()
+                scene_location = scene_match.group(2).strip() if scene_match.group(2) else ""
+                if not scene_location and next_line and not G_HEADER_RE.match(next_line.upper()):
+                    scene_location = next_line
+                b.new_scene(roman_to_int(scene_match.group(1)), stripped, scene_location)
+                b.speaker = None
+                continue
+
+        if first == 'A' and G_ACT_SCENE_RE.match(stripped):
+            in_scene_header = False
+            continue
+
+        if not b.scene:
+            continue
+
+        if G_DIRECTION_RE.search(stripped):
+            if b.flush():
+                b.speaker = None
+            b.direction(stripped)
+            in_scene_header = False
+            continue
+
+        if in_scene_header:
+            continue
+
+        speaker_match = G_SPEAKER_RE.match(stripped)
+        if speaker_match:
+            b.flush()
+            b.speaker = speaker_match.group(1).strip().upper()
+            continue
+
+        if first == '[' or first == '(':
+            b.flush()
+            b.direction(stripped)
+            b.speaker = None
+        elif b.speaker:
+            b.buffer.append(stripped)
+
+
+def _parse_act_scene(window: Iterable[Tuple[Optional[str], str, Optional[str]]], b: _PlayBuilder) -> None:
+    """"Act 1 Scene 1" markers with all-caps speaker names on their own line."""
+    play_started = False
+    for prev_line, stripped, next_line in window:
+        if not stripped:
+            continue
+
+        if stripped[0] in 'Aa':
+            m = ACT_SCENE_MARKER_RE.match(stripped)
+            if m:
+                play_started = True
+                act_num = int(m.group(1))
+                if b.scene and b.flush():
+                    b.speaker = None
+                if b.act is None or b.act['act_number'] != act_num:
+                    b.new_act(act_num, f"ACT {to_roman(act_num)}")
+
+                # Scene location is usually on the previous or next line
+                scene_location = ""
+                if prev_line and not A_PREV_ACT_RE.match(prev_line):
+                    scene_location = prev_line
+                if not scene_location and next_line and not A_NEXT_DIRECTION_RE.match(next_line):
+                    scene_location = next_line
+
+                scene_num = int(m.group(2))
+                b.new_scene(
+                    scene_num,
+                    f"Scene {to_roman(scene_num)}. {scene_location}" if scene_location else f"Scene {to_roman(scene_num)}",
+                    scene_location.upper() if scene_location else "",
+                )
+                continue
+
+        if not play_started:
+            continue
+
+        if A_DIRECTION_RE.match(stripped):
+            if b.flush():
+                b.speaker = None
+            b.direction(stripped)
+            continue
+
+        if stripped.isupper() and len(stripped) < 30 and not A_NOT_SPEAKER_RE.match(stripped):
+            b.flush()
+            b.speaker = stripped
+            continue
+
+        if b.speaker:
+            b.buffer.append(stripped)
+
+
+LAYOUTS: Dict[str, Callable[[Iterable[Tuple[Optional[str], str, Optional[str]]], _PlayBuilder], None]] = {
+    'gutenberg': _parse_gutenberg,
+    'act_scene': _parse_act_scene,
+}
+
+
+def _check_layout(layout: str) -> None:
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}' (expected one of: {', '.join(LAYOUTS)})")
+
+
+def parse_lines(lines: List[str], layout: str = 'auto', title: Optional[str] = None,
+                indexes: bool = False) -> Dict[str, Any]:
+    """Parse already-read play lines; see parse_play."""
+    if layout == 'auto':
+        layout = detect_layout(lines)
+    _check_layout(layout)
+    builder = _PlayBuilder(title or detect_title(lines), indexes)
+    LAYOUTS[layout](_window(lines), builder)
+    builder.finish()
+    return builder.play
+
+
+def parse_play(filename: str, layout: str = 'auto', title: Optional[str] = None,
+               indexes: bool = False) -> Dict[str, Any]:
+    """
+    Parse a play text file into {title, author, acts: [{scenes: [{lines}]}]}.
+    layout is 'auto' (detect from the headings), 'gutenberg' or 'act_scene';
+    indexes=True adds the "indexes" of build_indexes.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    return parse_lines(lines, layout, title, indexes)
+
+
+def stream_lines(lines: Iterable[str], out: TextIO, layout: str,
+                 title: Optional[str] = None, indexes: bool = False) -> Dict[str, int]:
+    """
+    Parse lines from any iterable (file, stdin) and write the play JSON to out
+    scene by scene. Only a three-line window, the first 50 lines (for title
+    detection) and the scene being built are held in memory; indexes=True adds
+    a few integers per speech. layout must be given; use stream_play to
+    auto-detect it from a file.
+    Returns {'acts', 'scenes', 'lines'} counts.
+    """
+    _check_layout(layout)
+    detector = _TitleDetector()
+    it = iter(lines)
+    head = list(islice(it, 50))
+    for line in head:
+        detector.feed(line.strip())
+
+    def tracked():
+        yield from head
+        for line in it:
+            detector.feed(line.strip())
+            yield line
+
+    builder = _StreamingPlayBuilder(out, (lambda: title) if title else (lambda: detector.title), indexes)
+    LAYOUTS[layout](_window(tracked()), builder)
+    builder.finish()
+    return builder.stats
+
+
+def stream_play(filename: str, output_file: str, layout: str = 'auto',
+                title: Optional[str] = None, indexes: bool = False) -> Dict[str, int]:
+    """
+    Constant-memory parse_play: reads the file line by line and writes each
+    scene to output_file as it completes. Auto-detection makes one extra
+    streaming pass over the file. Returns {'acts', 'scenes', 'lines'} counts.
+    """
+    if layout == 'auto':
+        with open(filename, 'r', encoding='utf-8') as f:
+            layout = detect_layout(f)
+    with open(filename, 'r', encoding='utf-8') as f, open(output_file, 'w', encoding='utf-8') as out:
+        return stream_lines(f, out, layout, title, indexes)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    layout = next((a.split('=', 1)[1] for a in sys.argv[1:] if a.startswith('--layout=')), 'auto')
+    stream = '--stream' in sys.argv[1:]
+    indexes = '--indexes' in sys.argv[1:]
+    shards = next((a.split('=', 1)[1] for a in sys.argv[1:] if a.startswith('--shards=')), None)
+    if not args or (args[0] == '-' and not (stream and layout != 'auto' and len(args) > 1)):
+        print("Usage: python play_parser.py input.txt [output.json] [\"Play Title\"] [--layout=auto|gutenberg|act_scene] [--stream]")
+        print("       (reading stdin with '-' needs --stream, --layout and an output file)")
+        print("       [--shards=DIR] also writes DIR/index.json plus one file per scene")
+        print("       [--indexes] adds speaker and entrance/exit indexes after the acts")
+        sys.exit(1)
+
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else re.sub(r'\.txt$', '', input_file) + '.json'
+    title = args[2] if len(args) > 2 else None
+
+    try:
+        if stream:
+            print(f"Streaming {input_file} to {output_file}...")
+            if input_file == '-':
+                with open(output_file, 'w', encoding='utf-8') as out:
+                    stats = stream_lines(sys.stdin, out, layout, title, indexes)
+            else:
+                stats = stream_play(input_file, output_file, layout, title, indexes)
+            print(f"\nConversion complete!")
+            print(f"Total Acts: {stats['acts']}")
+            print(f"Total Scenes: {stats['scenes']}")
+            print(f"Total Lines/Entries: {stats['lines']}")
+            print(f"Output saved to: {output_file}")
+            if shards:
+                print("Note: --shards is not available with --stream; run play_shards.py on the output")
+            return
+
+        print(f"Reading {input_file}...")
+        with open(input_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        if layout == 'auto':
+            layout = detect_layout(lines)
+            print(f"Detected layout: {layout}")
+        play_data = parse_lines(lines, layout, title, indexes)
+
+        print(f"Writing JSON to {output_file}...")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            dump_play(play_data, f)
+
+        total_acts = len(play_data['acts'])
+        total_scenes = sum(len(act['scenes']) for act in play_data['acts'])
+        total_lines = sum(
+            len(scene['lines'])
+            for act in play_data['acts']
+            for scene in act['scenes']
+        )
+
+        print(f"\nConversion complete!")
+        print(f"Play: {play_data['title']}")
+        print(f"Total Acts: {total_acts}")
+        print(f"Total Scenes: {total_scenes}")
+        print(f"Total Lines/Entries: {total_lines}")
+        if indexes:
+            print(f"Speakers: {len(play_data['indexes']['speakers'])}")
+        print(f"Output saved to: {output_file}")
+
+        if shards:
+            from play_shards import write_play_shards
+            stats = write_play_shards(play_data, shards)
+            print(f"Scene shards: {stats['scenes']} in {shards}/ ({stats['written']} files written)")
+
+    except FileNotFoundError:
+        print(f"Error: File '{input_file}' not found")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
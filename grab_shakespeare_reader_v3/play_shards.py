@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Split play JSON into a small index plus one file per scene for lazy loading.
+Usage: python play_shards.py romeo_and_juliet_.json [out_dir]   # default: romeo_and_juliet_/
+
+Writes:
+  <out_dir>/index.json          title, author, speakers, the indexes file and
+                                hash and, per scene, its title/location,
+                                lineCount, speakers, file and hash
+  <out_dir>/speaker_index.json  the speaker and entrance/exit indexes
+                                (play_parser.build_indexes), fetched only
+                                when the viewer needs them
+  <out_dir>/act1_scene1.json    {"scene_number", "scene_title", "location", "lines"}
+
+Shard files hold the scene exactly as in the full play JSON, without
+whitespace. indexRegular.html loads index.json, then fetches only the scene
+being read (for both versions of the play) and prefetches the next one.
+Unchanged shards are not rewritten; shards for scenes that no longer exist
+are removed.
+"""
+
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Any
+
+from play_parser import build_indexes
+
+SHARDS_VERSION = 1
+SHARD_INDEX = 'index.json'
+SPEAKER_INDEX = 'speaker_index.json'
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content unless the file already holds exactly that. Returns True if written."""
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def scene_speakers(scene: Dict[str, Any]) -> list:
+    """Speakers in order of first appearance, without stage directions."""
+    seen = {}
+    for line in scene.get('lines', []):
+        speaker = line.get('speaker')
+        if speaker and speaker != 'STAGE_DIRECTION':
+            seen.setdefault(speaker, None)
+    return list(seen)
+
+
+def write_play_shards(play: Dict[str, Any], out_dir: str) -> Dict[str, int]:
+    """Write index.json and one shard per scene into out_dir. Returns counts."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    written = 0
+    keep = {SHARD_INDEX, SPEAKER_INDEX}
+    all_speakers = {}
+    acts = []
+    for ai, act in enumerate(play.get('acts', []), 1):
+        scenes = []
+        for si, scene in enumerate(act.get('scenes', []), 1):
+            name = f"act{ai}_scene{si}.json"
+            body = json.dumps(scene, separators=(',', ':'), ensure_ascii=False)
+            written += write_if_changed(out / name, body)
+            keep.add(name)
+            speakers = scene_speakers(scene)
+            for speaker in speakers:
+                all_speakers.setdefault(speaker, None)
+            scenes.append({
+                'scene_number': scene.get('scene_number'),
+                'scene_title': scene.get('scene_title'),
+                'location': scene.get('location', ''),
+                'lineCount': len(scene.get('lines', [])),
+                'speakers': speakers,
+                'file': name,
+                'hash': hashlib.sha256(body.encode('utf-8')).hexdigest()[:16],
+            })
+        acts.append({'act_number': act.get('act_number'), 'act_title': act.get('act_title'), 'scenes': scenes})
+
+    index = {
+        'shards': SHARDS_VERSION,
+        'title': play.get('title'),
+        'author': play.get('author'),
+        'speakers': list(all_speakers),
+        'acts': acts,
+    }
+    # Speaker lookups and statistics work from this file alone, before any shard loads;
+    # it stays out of index.json so startup fetches only the small scene list.
+    indexes = json.dumps(play.get('indexes') or build_indexes(play), separators=(',', ':'), ensure_ascii=False)
+    written += write_if_changed(out / SPEAKER_INDEX, indexes)
+    index['indexes'] = {'file': SPEAKER_INDEX, 'hash': hashlib.sha256(indexes.encode('utf-8')).hexdigest()[:16]}
+    written += write_if_changed(out / SHARD_INDEX, json.dumps(index, separators=(',', ':'), ensure_ascii=False))
+
+    removed = 0
+    for path in out.glob('act*_scene*.json'):
+        if path.name not in keep:
+            path.unlink()
+            removed += 1
+    return {'scenes': len(keep) - 2, 'written': written, 'removed': removed}
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python play_shards.py play.json [out_dir]")
+        sys.exit(1)
+
+    input_file = sys.argv[1]
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else str(Path(input_file).with_suffix(''))
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            play = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: {input_file}: {e}")
+        sys.exit(1)
+
+    stats = write_play_shards(play, out_dir)
+    print(f"{input_file} -> {out_dir}/: {stats['scenes']} scenes, "
+          f"{stats['written']} files written, {stats['removed']} stale removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ Replace specific lines in a file with clipboard content.
 
 Usage:
     python replace_lines.py <start_line> <end_line> [filename]
+    python replace_lines.py --patch=changes.patch [filename] [--dry-run]
+    python replace_lines.py undo|redo|log [filename]
 
 Examples:
     python replace_lines.py 421 444
@@ -13,9 +15,14 @@ The script will:
 1. Read content from your clipboard
 2. Auto-balance lines if clipboard has different number of lines
 3. Replace lines <start_line> through <end_line> (inclusive) with clipboard content
-4. Create a backup of the original file (.bak)
+4. Journal the change in <file>.journal so it can be undone (see edit_journal.py)
 5. Show you what changed
 
+With --patch, every "@@ <start> <end>" hunk in the patch file (see
+line_patch.py) is balanced to its range and applied in one pass, without
+prompting, and the file is replaced atomically. Line numbers refer to the
+file before the patch.
+
   - ✨ Auto-balances lines (merges/pads)
 
 
@@ -24,9 +31,66 @@ The script will:
 import sys
 import os
 import re
-import pyperclip
+import heapq
 from pathlib import Path
 
+from line_patch import patch_file
+from edit_journal import JOURNAL_COMMANDS, run_command, save_edit
+
+def merge_adjacent(parts, target_count, measure, join):
+    """
+    Repeatedly join the adjacent pair with the smallest measure(a) + measure(b)
+    (leftmost pair on ties) until target_count parts remain.
+
+    Segments form a doubly linked list and candidate pairs sit in a heap, so
+    each merge costs O(log n) instead of a rescan of every pair. Heap entries
+    that went stale (a side was merged since) are skipped when popped.
+    """
+    n = len(parts)
+    if n <= max(target_count, 1):
+        return parts[:]
+
+    text = parts[:]
+    size = [measure(p) for p in parts]
+    version = [0] * n
+    prev = list(range(-1, n - 1))
+    next_ = list(range(1, n + 1))
+    next_[-1] = -1
+
+    # (combined size, left id, right id, left version, right version); ids keep
+    # their original order, so the smallest left id is the leftmost pair
+    heap = [(size[i] + size[i + 1], i, i + 1, 0, 0) for i in range(n - 1)]
+    heapq.heapify(heap)
+
+    count = n
+    while count > target_count and heap:
+        _, left, right, left_version, right_version = heapq.heappop(heap)
+        if version[left] != left_version or version[right] != right_version or next_[left] != right:
+            continue
+
+        text[left] = join(text[left], text[right])
+        size[left] = measure(text[left])
+        version[left] += 1
+        version[right] = -1
+        after = next_[right]
+        next_[left] = after
+        if after != -1:
+            prev[after] = left
+        count -= 1
+
+        before = prev[left]
+        if before != -1:
+            heapq.heappush(heap, (size[before] + size[left], before, left, version[before], version[left]))
+        if after != -1:
+            heapq.heappush(heap, (size[left] + size[after], left, after, version[left], version[after]))
+
+    result = []
+    i = 0
+    while i != -1:
+        result.append(text[i])
+        i = next_[i]
+    return result
+
 def smart_split_lines(text, target_count):
     """
     Split text into approximately target_count lines intelligently.
@@ -78,20 +142,9 @@ def smart_split_lines(text, target_count):
                 new_parts.append(part)
         parts = new_parts
 
-    # If we have too many parts, merge them
-    while len(parts) > target_count:
-        # Find the two shortest adjacent parts to merge
-        min_idx = 0
-        min_len = len(parts[0]) + len(parts[1])
-        for i in range(len(parts) - 1):
-            combined_len = len(parts[i]) + len(parts[i+1])
-            if combined_len < min_len:
-                min_len = combined_len
-                min_idx = i
-
-        # Merge the two parts
-        parts[min_idx] = parts[min_idx] + ' ' + parts[min_idx + 1]
-        parts.pop(min_idx + 1)
+    # If we have too many parts, merge the shortest adjacent pairs
+    if len(parts) > target_count:
+        parts = merge_adjacent(parts, target_count, len, lambda a, b: a + ' ' + b)
 
     # Clean up and ensure each line ends with newline
     lines = [part.strip() + '\n' for part in parts if part.strip()]
@@ -102,22 +155,9 @@ def smart_merge_lines(lines, target_count):
     """
     Merge lines down to target_count by combining adjacent lines.
     """
-    while len(lines) > target_count:
-        # Find the two shortest adjacent lines to merge
-        min_idx = 0
-        min_len = len(lines[0].strip()) + len(lines[1].strip())
-
-        for i in range(len(lines) - 1):
-            combined_len = len(lines[i].strip()) + len(lines[i+1].strip())
-            if combined_len < min_len:
-                min_len = combined_len
-                min_idx = i
-
-        # Merge the two lines
-        merged = lines[min_idx].strip() + ' ' + lines[min_idx + 1].strip() + '\n'
-        lines[min_idx] = merged
-        lines.pop(min_idx + 1)
-
+    if len(lines) > target_count:
+        lines[:] = merge_adjacent(lines, target_count, lambda line: len(line.strip()),
+                                  lambda a, b: a.strip() + ' ' + b.strip() + '\n')
     return lines
 
 def balance_lines(clipboard_lines, target_count):
@@ -177,16 +217,6 @@ def replace_lines(filename, start_line, end_line, clipboard_content, auto_balanc
         print(f"❌ Error: End line {end_line} is out of range (file has {len(lines)} lines)")
         return False
 
-    # Create backup
-    backup_file = filename + '.bak'
-    try:
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
-        print(f"✅ Backup created: {backup_file}")
-    except Exception as e:
-        print(f"❌ Error creating backup: {e}")
-        return False
-
     # Split clipboard content into lines
     new_lines = clipboard_content.splitlines(keepends=True)
 
@@ -251,25 +281,36 @@ def replace_lines(filename, start_line, end_line, clipboard_content, auto_balanc
     # Replace the lines
     new_file_lines = lines[:start_idx] + new_lines + lines[end_idx:]
 
-    # Write back to file
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.writelines(new_file_lines)
-        print(f"\n✅ Successfully replaced lines {start_line}-{end_line} in '{filename}'")
-        print(f"   Original file backed up to '{backup_file}'")
-        return True
-    except Exception as e:
-        print(f"❌ Error writing file: {e}")
-        print(f"   Your original file is safe in '{backup_file}'")
+    # Write back to file and journal the change for undo
+    hunks = [{'start': start_line, 'end': end_line, 'lines': new_lines}]
+    if not save_edit(filename, lines, hunks, new_file_lines, f"lines {start_line}-{end_line}"):
         return False
+    print(f"\n✅ Successfully replaced lines {start_line}-{end_line} in '{filename}'")
+    print(f"   Undo with: python replace_lines.py undo {filename}")
+    return True
 
 def main():
     # Default filename
     default_filename = "romeo_and_juliet_modern.txt"
 
+    # Journal commands: undo / redo / log [filename]
+    if len(sys.argv) > 1 and sys.argv[1] in JOURNAL_COMMANDS:
+        success = run_command(sys.argv[1:], default_filename)
+        sys.exit(0 if success else 1)
+
+    # Patch mode: many hunks from a file, applied in one pass without prompting
+    patch_path = next((a.split('=', 1)[1] for a in sys.argv[1:] if a.startswith('--patch=')), None)
+    if patch_path:
+        args = [a for a in sys.argv[1:] if not a.startswith('--')]
+        filename = args[0] if args else default_filename
+        success = patch_file(filename, patch_path, balance=balance_lines, dry_run='--dry-run' in sys.argv[1:])
+        sys.exit(0 if success else 1)
+
     # Parse arguments
     if len(sys.argv) < 3:
         print("Usage: python replace_lines.py <start_line> <end_line> [filename]")
+        print("       python replace_lines.py --patch=changes.patch [filename] [--dry-run]")
+        print("       python replace_lines.py undo|redo|log [filename]")
         print(f"\nDefault filename: {default_filename}")
         print("\nExamples:")
         print("  python replace_lines.py 421 444")
@@ -277,7 +318,7 @@ def main():
         print("\nFeatures:")
         print("  ✂️  Auto-balances lines to match target count")
         print("  🔀 Intelligently merges or splits text")
-        print("  🔒 Creates backup before changes")
+        print("  ↩️  Journals every change for undo/redo")
         sys.exit(1)
 
     try:
@@ -305,6 +346,7 @@ def main():
 
     # Get clipboard content
     try:
+        import pyperclip
         clipboard_content = pyperclip.paste()
     except Exception as e:
         print(f"❌ Error accessing clipboard: {e}")
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Ranked full-text and phrase search across every play in this folder.
+Usage: python search_plays.py "to be or not to be"
+       python search_plays.py '"poor yorick"' horatio --limit=5
+       python search_plays.py -i                      # interactive, index loaded once
+
+Every *.txt and *.json play is tokenized into one positional inverted index
+(term -> sorted token positions). A play kept in several files (the .txt
+source, its converted .json, renamed copies) is indexed once, keyed by its
+title; the .json is preferred. Quoted text is matched as a phrase and bare
+words must all appear (use --any for OR). Matching speeches or lines are ranked
+with BM25 and reported with their act, scene and speaker.
+
+The index is cached in .search_index.json next to the plays, keyed by each
+file's sha256, so only a changed play triggers a rebuild.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from convert_plays import MANIFEST_NAME
+from grabshakespeare import build_play_index, locate
+from play_parser import UNKNOWN_TITLE, detect_title
+
+# Bump when tokenization, source selection or the cache layout changes.
+SEARCH_INDEX_VERSION = 2
+CACHE_NAME = '.search_index.json'
+TOKEN_RE = re.compile(r'[^\W_]+')
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def play_files(folder: Path) -> List[Path]:
+    """Play sources in folder: *.txt and *.json, minus sidecars and compact copies."""
+    files = []
+    for path in sorted(folder.iterdir()):
+        if path.suffix not in ('.txt', '.json') or path.name.startswith('.') or path.name == MANIFEST_NAME:
+            continue
+        # *.min.json is a compact copy of a play that is indexed already (play_compact.py)
+        if path.name.endswith(('.index.json', '.min.json')):
+            continue
+        files.append(path)
+    return files
+
+
+def play_units(path: Path, data: bytes, manifest: Optional[Dict[str, Any]] = None
+               ) -> Tuple[Optional[str], List[Tuple[int, Optional[int], Optional[int], Optional[str], str]]]:
+    """
+    Split one play into searchable units: (ref, act, scene, speaker, text).
+    JSON plays yield one unit per speech (ref = position within its scene);
+    text plays yield one unit per non-blank line (ref = 1-based line number).
+    Returns (title, units); the title is the JSON's own, or for text the
+    manifest's or the detected one, as convert_plays would give it. It is
+    None when unknown.
+    """
+    units = []
+    if path.suffix == '.json':
+        play = json.loads(data.decode('utf-8'))
+        if not isinstance(play, dict):
+            raise ValueError(f"{path.name}: not a play")
+        for act in play.get('acts', []):
+            for scene in act.get('scenes', []):
+                for n, entry in enumerate(scene.get('lines', []), 1):
+                    units.append((n, act.get('act_number'), scene.get('scene_number'),
+                                  entry.get('speaker'), entry.get('text', '')))
+        return play.get('title'), units
+
+    lines = data.decode('utf-8').splitlines()
+    title = (manifest or {}).get(path.name, {}).get('title') or detect_title(lines)
+    index = build_play_index(lines)
+    for i, line in enumerate(lines):
+        text = line.strip()
+        if text:
+            act, scene, speaker = locate(index, i)
+            units.append((i + 1, act, scene, speaker, text))
+    return (None if title == UNKNOWN_TITLE else title), units
+
+
+def play_key(path: Path, title: Optional[str]) -> str:
+    """Files with the same key hold the same play; untitled files stand alone."""
+    return ' '.join(title.casefold().split()) if title else f"file:{path.name}"
+
+
+def build_search_index(folder: Path, cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Index every play in folder. Token positions are global across the corpus;
+    starts[u] is the first position of unit u, so a position maps back to its
+    unit by binary search. Returns the cached index untouched when no play
+    changed.
+    """
+    sources = []
+    hashes = {}
+    for path in play_files(folder):
+        data = path.read_bytes()
+        hashes[path.name] = hashlib.sha256(data).hexdigest()
+        sources.append((path, data))
+    # Manifest titles decide which text plays are duplicates
+    manifest_path = folder / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists():
+        manifest_data = manifest_path.read_bytes()
+        hashes[MANIFEST_NAME] = hashlib.sha256(manifest_data).hexdigest()
+        try:
+            manifest = json.loads(manifest_data.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError):
+            manifest = {}
+
+    if cached and cached.get('version') == SEARCH_INDEX_VERSION and cached.get('files') == hashes:
+        return cached
+
+    # One source per play: .json before .txt, then the first name in order
+    chosen: Dict[str, Tuple[Path, List[Tuple]]] = {}
+    for path, data in sources:
+        try:
+            title, file_units = play_units(path, data, manifest)
+        except (ValueError, UnicodeDecodeError, AttributeError, TypeError, KeyError):
+            # Not a play (or malformed); skip it rather than abort the search
+            continue
+        key = play_key(path, title)
+        if key not in chosen or (path.suffix == '.json' and chosen[key][0].suffix != '.json'):
+            chosen[key] = (path, file_units)
+
+    names, units, starts = [], [], []
+    postings: Dict[str, List[int]] = {}
+    pos = 0
+    for path, file_units in sorted(chosen.values(), key=lambda item: item[0].name):
+        file_id = len(names)
+        names.append(path.name)
+        for ref, act, scene, speaker, text in file_units:
+            tokens = tokenize(text)
+            if not tokens:
+                continue
+            units.append([file_id, ref, act, scene, speaker, text])
+            starts.append(pos)
+            for token in tokens:
+                postings.setdefault(token, []).append(pos)
+                pos += 1
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'files': hashes,
+        'names': names,
+        'units': units,
+        'starts': starts,
+        'total': pos,
+        'postings': postings,
+    }
+
+
+def load_search_index(folder: Path, rebuild: bool = False) -> Dict[str, Any]:
+    """Load the cached index, rebuilding and saving it if any play changed."""
+    cache_path = folder / CACHE_NAME
+    cached = None
+    if not rebuild:
+        try:
+            cached = json.loads(cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            cached = None
+    index = build_search_index(folder, cached)
+    if index is not cached:
+        try:
+            cache_path.write_text(json.dumps(index, separators=(',', ':'), ensure_ascii=False),
+                                  encoding='utf-8')
+        except OSError:
+            pass
+    return index
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """Quoted text becomes one phrase clause; each bare word is its own clause."""
+    clauses = []
+    for phrase, word in QUERY_RE.findall(query):
+        tokens = tokenize(phrase or word)
+        if tokens:
+            clauses.append(tokens)
+    return clauses
+
+
+def unit_of(index: Dict[str, Any], pos: int) -> int:
+    return bisect_right(index['starts'], pos) - 1
+
+
+def phrase_units(index: Dict[str, Any], tokens: List[str]) -> Counter:
+    """Occurrences per unit of the phrase, counted at the unit where it starts."""
+    postings = index['postings']
+    lists = [postings.get(t) for t in tokens]
+    if not all(lists):
+        return Counter()
+    if len(tokens) == 1:
+        return Counter(unit_of(index, p) for p in lists[0])
+
+    # Walk from the rarest term so the candidate set starts small.
+    pivot = min(range(len(tokens)), key=lambda k: len(lists[k]))
+    candidates = [p - pivot for p in lists[pivot]]
+    for k, plist in enumerate(lists):
+        if k == pivot:
+            continue
+        # Candidates and postings are both sorted, so each lookup can start
+        # where the previous one stopped
+        kept = []
+        lo = 0
+        for p in candidates:
+            lo = bisect_left(plist, p + k, lo)
+            if lo == len(plist):
+                break
+            if plist[lo] == p + k:
+                kept.append(p)
+        candidates = kept
+        if not candidates:
+            return Counter()
+
+    units = index['units']
+    hits = Counter()
+    last = len(tokens) - 1
+    for p in candidates:
+        u = unit_of(index, p)
+        # Phrases may run across lines or speeches, but never across plays.
+        if units[unit_of(index, p + last)][0] == units[u][0]:
+            hits[u] += 1
+    return hits
+
+
+def unit_length(index: Dict[str, Any], u: int) -> int:
+    starts = index['starts']
+    end = starts[u + 1] if u + 1 < len(starts) else index['total']
+    return end - starts[u]
+
+
+def search(index: Dict[str, Any], query: str, limit: int = 10,
+           require_all: bool = True) -> List[Tuple[float, int]]:
+    """Rank units for query with BM25 over term and phrase clauses; returns [(score, unit)]."""
+    clauses = parse_query(query)
+    if not clauses or not index['units']:
+        return []
+    n_units = len(index['units'])
+    avg_len = index['total'] / n_units
+
+    matches = [phrase_units(index, tokens) for tokens in clauses]
+    if require_all:
+        candidates = set(matches[0])
+        for hits in matches[1:]:
+            candidates &= set(hits)
+    else:
+        candidates = set().union(*matches)
+
+    scores = Counter()
+    for hits, tokens in zip(matches, clauses):
+        if not hits:
+            continue
+        df = len(hits)
+        idf = math.log(1 + (n_units - df + 0.5) / (df + 0.5))
+        # Longer phrases are more specific than their df alone suggests.
+        weight = idf * len(tokens)
+        for u in candidates:
+            tf = hits.get(u)
+            if tf:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * unit_length(index, u) / avg_len)
+                scores[u] += weight * tf * (BM25_K1 + 1) / (tf + norm)
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [(score, u) for u, score in ranked[:limit]]
+
+
+def describe(index: Dict[str, Any], u: int) -> Dict[str, Any]:
+    file_id, ref, act, scene, speaker, text = index['units'][u]
+    name = index['names'][file_id]
+    if act and scene:
+        location = f"Act {act}, Scene {scene}"
+    elif act:
+        location = f"Act {act}"
+    else:
+        location = "Unknown location"
+    where = f"{name}:{ref}" if name.endswith('.txt') else f"{name} [{act}.{scene} #{ref}]"
+    return {'file': name, 'ref': ref, 'where': where, 'location': location,
+            'speaker': speaker, 'text': text}
+
+
+def print_results(index: Dict[str, Any], query: str, limit: int, require_all: bool,
+                  as_json: bool = False) -> None:
+    start = time.perf_counter()
+    results = search(index, query, limit, require_all)
+    elapsed = (time.perf_counter() - start) * 1000
+    if as_json:
+        for score, u in results:
+            print(json.dumps(dict(describe(index, u), score=round(score, 3)), ensure_ascii=False))
+        return
+    print(f"{len(results)} result(s) for {query!r} in {elapsed:.1f} ms")
+    for rank, (score, u) in enumerate(results, 1):
+        hit = describe(index, u)
+        who = f" · {hit['speaker']}" if hit['speaker'] else ""
+        print(f"\n{rank:2}. {hit['where']}  {hit['location']}{who}  (score {score:.2f})")
+        for line in hit['text'].splitlines()[:4]:
+            print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ranked phrase search across all plays')
+    parser.add_argument('query', nargs='*', help='Words and "quoted phrases"')
+    parser.add_argument('-d', '--dir', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='Folder of plays (default: this script\'s folder)')
+    parser.add_argument('--limit', type=int, default=10, help='Results to show (default: 10)')
+    parser.add_argument('--any', action='store_true', help='Match any clause instead of all')
+    parser.add_argument('--json', action='store_true', help='Print one JSON object per result')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the cached index')
+    parser.add_argument('-i', '--interactive', action='store_true', help='Prompt for queries')
+    args = parser.parse_args()
+
+    if not args.query and not args.interactive:
+        parser.error('give a query or use -i')
+
+    folder = Path(args.dir)
+    start = time.perf_counter()
+    index = load_search_index(folder, args.rebuild)
+    if not args.json:
+        print(f"Indexed {len(index['names'])} files, {len(index['units']):,} units, "
+              f"{len(index['postings']):,} terms in {time.perf_counter() - start:.2f}s\n")
+
+    if args.query:
+        print_results(index, ' '.join(args.query), args.limit, not args.any, args.json)
+    if args.interactive:
+        while True:
+            try:
+                query = input('\nsearch> ').strip()
+            except EOFError:
+                break
+            if not query:
+                break
+            print_results(index, query, args.limit, not args.any, args.json)
+
+
+if __name__ == "__main__":
+    main()